@@ -1,4 +1,5 @@
 """API routes for core platform functionality."""
+import asyncio
 import time
 import logging
 from fastapi import APIRouter, HTTPException
@@ -87,35 +88,37 @@ async def analyze_ticker(request: AnalyzeRequest):
     Returns comprehensive market analysis including sentiment score, risk level, and summary.
     """
     try:
-        from services.market_service import MarketDataService
-        from services.ai_service import AIService
+        from services.market_service import get_market_service
+        from services.ai_service import compact_news, get_ai_service
         
-        # Initialize services
-        market_service = MarketDataService()
+        # Shared instance, so its price/macro caches survive across requests
+        market_service = get_market_service()
         
         try:
-            ai_service = AIService()
+            ai_service = get_ai_service()
         except Exception as e:
             raise HTTPException(
                 status_code=503,
                 detail=f"AI service unavailable: {str(e)}"
             )
         
-        # Fetch market data
-        market_data = market_service.get_price_context(request.ticker.upper())
+        # Fetch market data and additional context concurrently, off the event loop
+        ticker = request.ticker.upper()
+        market_data, macro_context, technicals, raw_news = await asyncio.gather(
+            asyncio.to_thread(market_service.get_price_context, ticker),
+            asyncio.to_thread(market_service.get_macro_context),
+            asyncio.to_thread(market_service.get_technical_analysis, ticker),
+            asyncio.to_thread(market_service.get_latest_news, ticker)
+        )
         if not market_data:
             raise HTTPException(
                 status_code=404,
-                detail=f"Ticker {request.ticker.upper()} not found or invalid"
+                detail=f"Ticker {ticker} not found or invalid"
             )
+        news = compact_news(raw_news)
         
-        # Get additional context
-        macro_context = market_service.get_macro_context()
-        technicals = market_service.get_technical_analysis(request.ticker.upper())
-        news = market_service.get_latest_news(request.ticker.upper())
-        
-        # Run AI analysis
-        insight = ai_service.analyze_signal(
+        # Run AI analysis off the event loop
+        insight = await ai_service.analyze_signal_threaded(
             ticker=request.ticker.upper(),
             market_data=market_data,
             news=news,
@@ -3,22 +3,75 @@ Application-wide configuration constants
 Centralized configuration to avoid magic numbers and improve maintainability
 """
 import os
-from typing import Final
+from typing import Final, Optional
 
 # API Timeouts (in seconds)
 AI_API_TIMEOUT: Final[int] = int(os.getenv("AI_API_TIMEOUT", "60"))
 NEWS_API_TIMEOUT: Final[int] = 30
 MARKET_DATA_TIMEOUT: Final[int] = 15
+MARKET_DATA_MAX_WORKERS: Final[int] = 16  # Concurrent per-ticker market data fetches in a batch
 
 # Cache TTL (in seconds)
 CACHE_TTL_STOCK_PRICE: Final[int] = 300  # 5 minutes
 CACHE_TTL_NEWS: Final[int] = 3600  # 1 hour
 CACHE_TTL_MARKET_DATA: Final[int] = 300  # 5 minutes
+CACHE_TTL_FUNDAMENTALS: Final[int] = 86400  # 1 day - .info fundamentals, also keyed by date
+FUNDAMENTALS_CACHE_SIZE: Final[int] = 1024  # Tickers whose fundamentals are kept in process memory
+CACHE_TTL_PRICE_CONTEXT: Final[int] = 60  # 1 minute - get_price_context, in memory and Redis
+PRICE_CONTEXT_CACHE_SIZE: Final[int] = 1024  # Tickers whose price context is kept in process memory
+CACHE_TTL_MACRO: Final[int] = 10  # 10 seconds - VIX / market sentiment, in memory and Redis
+CACHE_TTL_AI_SIGNAL: Final[int] = int(os.getenv("CACHE_TTL_AI_SIGNAL", "900"))  # 15 minutes
+
+# On-disk cache location for AI analysis results
+AI_CACHE_DIR: Final[str] = os.getenv("AI_CACHE_DIR", ".cache/ai_signals")
+AI_MEMORY_CACHE_SIZE: Final[int] = 512  # Hot-ticker entries kept in process memory
+AI_MEMORY_CACHE_TTL: Final[int] = 60  # 1 minute
+
+# Gemini Model Configuration
+GEMINI_MODEL_NAME: Final[str] = "gemini-2.5-flash"
+GEMINI_TRANSPORT: Final[str] = os.getenv("GEMINI_TRANSPORT", "grpc")  # "grpc" (HTTP/2, pooled) or "rest"
+AI_CONTEXT_CACHE_TTL: Final[int] = 3600  # 1 hour - lifetime of the cached system prompt
+AI_BATCH_SIZE: Final[int] = 8  # Max tickers per multi-query Gemini call
+AI_TRANSIENT_MAX_ATTEMPTS: Final[int] = 4  # Attempts per Gemini call on rate limit/503/deadline
+AI_BACKOFF_INITIAL: Final[float] = 1.0  # Seconds, doubled per attempt (plus up to 1s jitter)
+AI_BACKOFF_MAX: Final[float] = 8.0
+AI_RETRY_DELAY_MAX: Final[float] = 30.0  # Cap on a server-requested retry delay (429 RetryInfo)
+AI_MAX_PROMPT_TOKENS: Final[int] = 30_000  # Approximate cap (chars / 4) per signal prompt
+AI_THESIS_TRUNCATE_CHARS: Final[int] = 4096  # User thesis kept when a prompt is oversized
+
+# Global Analyst batch scheduling
+ANALYST_BATCH_RPM: Final[float] = float(os.getenv("ANALYST_BATCH_RPM", "10"))  # Batch AI requests started per minute (Gemini Flash free tier)
+ANALYST_MAX_CONCURRENT_BATCHES: Final[int] = 4  # Batches fetching data or awaiting Gemini at once
+TICKER_PAGE_SIZE: Final[int] = 1000  # Rows per ticker_insights page (Supabase's default max-rows)
+
+# Global Analyst: skip the AI call for tickers whose inputs barely moved since the last run
+ANALYST_UNCHANGED_PRICE_MOVE: Final[float] = 0.005  # Relative price move (0.5%) below which a ticker is unchanged
+ANALYST_UNCHANGED_TTL: Final[int] = 6 * 3600  # Seconds a saved analysis can be reused (same trading day)
+ANALYST_UNCHANGED_CACHE_SIZE: Final[int] = 1024
+
+# Database Configuration
+DB_BULK_INSERT_CHUNK: Final[int] = 500  # Max rows per multi-row insert request
+DB_CLIENT_TIMEOUT: Final[int] = 10  # Seconds per PostgREST request
+DB_MAX_KEEPALIVE_CONNECTIONS: Final[int] = 20  # Warm connections kept in the PostgREST pool
+DB_KEEPALIVE_EXPIRY: Final[float] = 30.0  # Seconds an idle pooled connection stays open
+DB_BOT_USER_VERIFY_TTL: Final[int] = 3600  # Seconds a verified bot user ID is trusted before re-checking
+DB_WRITE_QUEUE_SIZE: Final[int] = 1000  # Max signals waiting for the background writer
+DB_WRITE_BATCH_SIZE: Final[int] = 100  # Max signals per background bulk insert
+DB_WRITE_BATCH_WAIT: Final[float] = 0.5  # Seconds the writer waits to fill a batch
+DB_RECENT_SIGNALS_SIZE: Final[int] = 10_000  # (ticker, minute) keys remembered to drop duplicate signals
+# Gzip request bodies on the raw bulk insert path; opt-in because the API gateway
+# in front of PostgREST must accept Content-Encoding: gzip
+DB_GZIP_REQUESTS: Final[bool] = os.getenv("DB_GZIP_REQUESTS", "false").lower() == "true"
+DB_GZIP_MIN_BYTES: Final[int] = 1024  # Smaller bodies are sent uncompressed
+DB_RETRY_BACKOFF_MAX: Final[float] = 2.0  # Cap (seconds) on the jittered wait between write retries
+DB_DEAD_LETTER_PATH: Final[str] = os.getenv("DB_DEAD_LETTER_PATH", ".cache/failed_signals.jsonl")  # Writes that failed every retry
 
 # Retry Configuration
 MAX_RETRIES: Final[int] = 3
 RETRY_BACKOFF_MS: Final[int] = 500
 NEWS_FETCH_DELAY_MS: Final[int] = 500
+NEWS_FETCH_WORKERS: Final[int] = 8  # Concurrent Yahoo Finance news requests
+NEWS_FETCH_RATE: Final[float] = 1000 / NEWS_FETCH_DELAY_MS  # Max Yahoo Finance requests started per second (old per-request delay)
 
 # News Validation
 MIN_TITLE_LENGTH: Final[int] = 10
@@ -64,5 +117,5 @@ SUSPICIOUS_DOMAINS: Final[tuple] = (
 )
 
 # Bot User Configuration
-BOT_USER_ID: Final[str] = os.getenv("BOT_USER_ID", "2de4618e-25af-4ebc-a572-f92b7954fb0e")
+BOT_USER_ID: Final[Optional[str]] = os.getenv("BOT_USER_ID")  # Required to post bot signals
 
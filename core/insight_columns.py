@@ -0,0 +1,95 @@
+"""Column mapping for ticker_insights rows shared by the analyst services."""
+
+
+# Strings that mean "no value" in market data
+_NULL_STRINGS = frozenset({'N/A', '-', '', 'None'})
+
+
+def safe_float(value):
+    """
+    Safely convert a value to float.
+    
+    Args:
+        value: Input value to convert (string, number, or None)
+    
+    Returns:
+        float or None: Converted float value, or None if conversion fails
+    
+    Handles:
+        - None values
+        - 'N/A', '-', empty strings
+        - Invalid numeric strings
+        - Already numeric values
+    """
+    if value is None:
+        return None
+    
+    # Fast path: most market data fields are already numeric
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
+    
+    # Handle string cases
+    if isinstance(value, str):
+        value = value.strip()
+        if value in _NULL_STRINGS:
+            return None
+    
+    # Try to convert to float
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+# ticker_insights columns filled from market_data: (column, market_data key)
+_INSIGHT_FLOAT_FIELDS = (
+    ('current_price', 'price'),
+    ('pe_ratio', 'pe_ratio'),
+    # God Mode institutional data
+    ('target_price', 'targetMean'),
+    ('short_float', 'shortPercentOfFloat'),
+    ('insider_held', 'heldPercentInsiders'),
+    # Enhanced fundamental metrics
+    ('roe', 'returnOnEquity'),
+    ('profit_margin', 'profitMargins'),
+    ('revenue_growth', 'revenueGrowth'),
+    ('earnings_growth', 'earningsGrowth'),
+    ('debt_to_equity', 'debtToEquity'),
+    ('current_ratio', 'currentRatio'),
+    # Dividend metrics
+    ('dividend_yield', 'dividendYield'),
+    ('payout_ratio', 'payoutRatio'),
+    # 52-week range
+    ('week_52_high', 'fiftyTwoWeekHigh'),
+    ('week_52_low', 'fiftyTwoWeekLow'),
+)
+_INSIGHT_TEXT_FIELDS = (
+    ('market_cap', 'market_cap'),
+    ('analyst_rating', 'recommendationKey'),
+    # Sector context
+    ('sector', 'sector'),
+    ('industry', 'industry'),
+)
+
+
+def market_insight_columns(market_data: dict, macro_context=None) -> dict:
+    """
+    Map market data and macro context onto ticker_insights columns.
+    
+    Args:
+        market_data: Market data from MarketDataService.get_price_context
+        macro_context: Pre-fetched VIX and market sentiment (optional)
+    
+    Returns:
+        Dictionary of column -> value, numeric columns coerced with safe_float
+    """
+    get = market_data.get
+    columns = {column: safe_float(get(key)) for column, key in _INSIGHT_FLOAT_FIELDS}
+    columns.update((column, get(key)) for column, key in _INSIGHT_TEXT_FIELDS)
+    # Macro context
+    columns['vix'] = safe_float(macro_context.get('vix')) if macro_context else None
+    columns['market_sentiment'] = macro_context.get('market_sentiment') if macro_context else None
+    return columns
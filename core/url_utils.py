@@ -0,0 +1,62 @@
+"""URL utility functions shared by the news and market data services."""
+import logging
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+from core.config import TRACKING_PARAMS
+
+logger = logging.getLogger(__name__)
+
+_TRACKING_PARAMS = frozenset(TRACKING_PARAMS)
+
+
+def clean_url(url: str) -> str:
+    """
+    Clean URL by removing Google tracking parameters and fixing malformed URLs.
+    
+    Args:
+        url: URL that may contain tracking parameters
+        
+    Returns:
+        Cleaned URL without tracking parameters
+    """
+    if not url or not isinstance(url, str):
+        return url or ''
+    
+    try:
+        # Fix URLs that have & instead of ? for query params (malformed)
+        if '&ved=' in url and '?' not in url.split('://')[1].split('/')[0]:
+            # Find where query params start (first & after domain)
+            parts = url.split('://', 1)
+            if len(parts) == 2:
+                scheme = parts[0]
+                rest = parts[1]
+                # Find first & that's likely a query param
+                if '&' in rest:
+                    path_part, query_part = rest.split('&', 1)
+                    url = f"{scheme}://{path_part}?{query_part}"
+        
+        parsed = urlparse(url)
+        
+        # Remove Google tracking parameters
+        query_params = parse_qs(parsed.query, keep_blank_values=True)
+        cleaned_params = {k: v for k, v in query_params.items()
+                          if k.lower() not in _TRACKING_PARAMS}
+        
+        # Reconstruct URL without tracking parameters
+        if cleaned_params:
+            new_query = urlencode(cleaned_params, doseq=True)
+        else:
+            new_query = ''
+        
+        return urlunparse((
+            parsed.scheme,
+            parsed.netloc,
+            parsed.path,
+            parsed.params,
+            new_query,
+            ''  # Remove fragment
+        ))
+        
+    except Exception as e:
+        logger.debug(f"Failed to clean URL {url[:50]}...: {str(e)}")
+        return url
@@ -0,0 +1,35 @@
+-- Create signal RPC: verify the bot user and insert its post in one round-trip
+-- Called by DatabaseService.save_signal via supabase.rpc("create_signal", ...)
+
+CREATE OR REPLACE FUNCTION create_signal(
+  p_user_id uuid,
+  p_ticker text,
+  p_content text,
+  p_ai_score integer,
+  p_ai_risk text,
+  p_ai_summary text
+)
+RETURNS bigint
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  new_id bigint;
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM profiles WHERE id = p_user_id) THEN
+    RAISE EXCEPTION 'Bot user % not found', p_user_id
+      USING ERRCODE = 'foreign_key_violation';
+  END IF;
+
+  INSERT INTO posts (user_id, ticker, content, ai_score, ai_risk, ai_summary)
+  VALUES (p_user_id, p_ticker, p_content, p_ai_score, p_ai_risk, p_ai_summary)
+  RETURNING id INTO new_id;
+
+  RETURN new_id;
+END;
+$$;
+
+-- SECURITY DEFINER bypasses RLS, so only the backend (service role) may call it
+REVOKE ALL ON FUNCTION create_signal(uuid, text, text, integer, text, text) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION create_signal(uuid, text, text, integer, text, text) TO service_role;
@@ -76,5 +76,6 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=port,
+        loop="auto",  # uvloop when installed (uvicorn[standard]), else asyncio
         log_level="info"
     )
@@ -1,6 +1,6 @@
 """Services module for Stock Read application."""
-from .ai_service import AIService
+from .ai_service import AIService, get_ai_service
 from .market_service import MarketDataService
 from .db_service import DatabaseService
 
-__all__ = ['AIService', 'MarketDataService', 'DatabaseService']
+__all__ = ['AIService', 'get_ai_service', 'MarketDataService', 'DatabaseService']
@@ -1,18 +1,41 @@
 """AI service for stock analysis using Google's Gemini model."""
+import asyncio
+import functools
 import json
 import os
-import re
-from typing import Dict, Any, List, Optional
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Annotated, DefaultDict, Dict, Any, List, Literal, NamedTuple, Optional, Sequence, Union
 
+import numpy as np
 import google.generativeai as genai
+from google.generativeai import caching
+from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field, validator, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, field_validator
 
 from core.logger import setup_logger, log_error, log_warning, log_info
 from core.security import sanitize_log_message
+from services.cache import FileCache, TieredCache, TTLCache, make_cache_key
 from core.config import (
     AI_API_TIMEOUT,
+    AI_BACKOFF_INITIAL,
+    AI_BACKOFF_MAX,
+    AI_BATCH_SIZE,
+    AI_CACHE_DIR,
+    AI_CONTEXT_CACHE_TTL,
+    AI_MEMORY_CACHE_SIZE,
+    AI_MAX_PROMPT_TOKENS,
+    AI_MEMORY_CACHE_TTL,
+    AI_RETRY_DELAY_MAX,
+    AI_THESIS_TRUNCATE_CHARS,
+    AI_TRANSIENT_MAX_ATTEMPTS,
+    CACHE_TTL_AI_SIGNAL,
+    GEMINI_MODEL_NAME,
+    GEMINI_TRANSPORT,
     VALID_USER_THESIS,
     VALID_RISK_LEVELS,
     DEFAULT_USER_THESIS,
@@ -20,10 +43,275 @@ from core.config import (
     DEFAULT_SENTIMENT_SCORE
 )
 
-load_dotenv()
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+try:
+    from json_repair import repair_json
+    HAS_JSON_REPAIR = True
+except ImportError:
+    HAS_JSON_REPAIR = False
 
 logger = setup_logger(__name__)
 
+_configured_api_key: Optional[str] = None
+_configure_lock = threading.Lock()
+
+
+def _ensure_configured() -> Optional[str]:
+    """
+    Load .env and configure the Gemini SDK once per process.
+    
+    Deferred until the first AIService is created so importing this module
+    has no filesystem or SDK side effects. Set STOCKREAD_SKIP_GENAI_INIT=1
+    to skip configuration entirely (e.g. in unit tests with a mocked SDK).
+    
+    Returns:
+        The configured API key, or None when initialization is skipped
+        
+    Raises:
+        ValueError: If the API key is missing or the SDK rejects it
+    """
+    global _configured_api_key
+    if _configured_api_key is not None:
+        return _configured_api_key
+    
+    with _configure_lock:
+        if _configured_api_key is not None:
+            return _configured_api_key
+        
+        load_dotenv()
+        if os.environ.get("STOCKREAD_SKIP_GENAI_INIT") == "1":
+            logger.info("Skipping Gemini API configuration (STOCKREAD_SKIP_GENAI_INIT=1)")
+            return None
+        
+        api_key = os.environ.get("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY not found in environment variables. Required for AI analysis.")
+        
+        try:
+            # gRPC keeps one long-lived HTTP/2 channel per process that all
+            # calls (sync and async) multiplex over, instead of per-call TLS setup
+            genai.configure(api_key=api_key, transport=GEMINI_TRANSPORT)
+        except Exception as e:
+            # Sanitize error message before logging
+            error_msg = sanitize_log_message(str(e))
+            logger.error("Failed to configure Gemini API: %s", error_msg)
+            raise ValueError(f"Failed to configure Gemini API: {error_msg}")
+        
+        _configured_api_key = api_key
+        return api_key
+
+
+# Evidence lines in prompt order: (short label, context key). Fields without
+# data are left out entirely rather than rendered as N/A.
+_EVIDENCE_FIELDS = (
+    ('Mood', 'vix_status'),
+    ('VIX', 'vix_value'),
+    ('Sector', 'sector'),
+    ('Industry', 'industry'),
+    ('Price', 'price'),
+    ('MCap', 'mcap'),
+    ('P/E', 'pe'),
+    ('Fwd P/E', 'forward_pe'),
+    ('PEG', 'peg'),
+    ('P/B', 'pb'),
+    ('ROE', 'roe'),
+    ('Margin', 'profit_margin'),
+    ('Rev Growth', 'revenue_growth'),
+    ('EPS Growth', 'earnings_growth'),
+    ('D/E', 'debt_to_equity'),
+    ('Current Ratio', 'current_ratio'),
+    ('Div Yield', 'div_yield'),
+    ('Payout', 'payout_ratio'),
+    ('52W High', 'week_52_high'),
+    ('52W Low', 'week_52_low'),
+    ('vs 52W High', 'distance_from_high'),
+    ('vs 52W Low', 'distance_from_low'),
+    ('Target', 'target_mean'),
+    ('Consensus', 'recommendation'),
+    ('Short Float', 'short_float'),
+    ('Insider Own', 'insider_ownership'),
+    ('Trend', 'tech_trend'),
+    ('RSI', 'tech_rsi'),
+    ('MACD', 'macd_trend'),
+    ('BB', 'bb_position'),
+)
+
+# Values that carry no information for the model
+_EMPTY_VALUES = (None, '', 'N/A', 'Unknown')
+
+# Full single-ticker prompt: evidence plus the user's thesis. Sent alongside the
+# static system prompt below.
+_PROMPT_TEMPLATE = (
+    "Analyze {ticker}. Evidence is objective; the user thesis must not influence the score.\n"
+    "{evidence}\n"
+    'User thesis: "{user_thesis_text}"'
+)
+
+
+# Static CIO instructions (scoring rules, comparison steps, output schema).
+# Sent once as a cached system instruction so each request only carries the
+# per-ticker evidence and user thesis.
+_STATIC_SYSTEM_PROMPT = """\
+You are the Chief Investment Officer AI for 'Stock Read'.
+Your job is to provide an OBJECTIVE market analysis for the ticker in each request, then compare it to the user's thesis.
+## RULES: OBJECTIVE MARKET SCORE (DO NOT LET USER INFLUENCE THIS)
+Weight the evidence as follows:
+- Fundamentals & Profitability: 15% (P/E, ROE, margins, growth rates)
+- Technicals: 25% (trend, RSI, MACD, Bollinger Bands)
+- News Sentiment: 20% (headline sentiment)
+- Institutional/Consensus: 40% (analyst target, ratings, institutional holdings) - PRIMARY DRIVER
+
+Apply these OBJECTIVE RULES:
+
+1. TARGET PRICE UPSIDE RULE (PRIMARY SCORE DRIVER):
+   - 15%+ below target → Score 70-85 (Strong Buy)
+   - 10-15% below target → Score 65-75 (Buy)
+   - 5-10% below target → Score 55-65 (Hold/Accumulate)
+   - At or above target → Score 40-55 (Hold/Trim)
+   - Target price upside OVERRIDES valuation concerns when consensus is Buy/Strong Buy
+
+2. VALUATION CONTEXT RULES:
+   a) MAGNIFICENT 7 PREMIUM (NVDA, AAPL, MSFT, AMZN, GOOGL, META, TSLA):
+      - P/E 25-50 is NORMAL if consensus is Buy/Strong Buy
+      - Call it "Premium Valuation" NOT "Overvaluation"
+      - PEG < 2.0 validates premium multiples
+
+   b) GROWTH STOCKS (Revenue Growth > 20%):
+      - Forward P/E more important than trailing P/E
+      - PEG Ratio < 1.5 = Attractive, even if P/E seems high
+      - Strong earnings growth (>25%) justifies P/E up to 40
+
+   c) VALUE STOCKS (P/E < 15, Dividend Yield > 3%):
+      - Focus on ROE, profit margins, debt levels
+      - Current Ratio > 1.5 = Strong balance sheet
+      - Dividend yield + payout ratio sustainability matters
+
+   d) SECTOR-RELATIVE VALUATION:
+      - Tech: P/E 20-35 is normal
+      - Healthcare/Pharma: P/E 15-25 is normal
+      - Utilities/REITs: Focus on dividend yield (3-5%)
+      - Financials: Use P/B ratio, target < 1.5
+
+3. PROFITABILITY QUALITY RULES:
+   - ROE > 15% = Excellent (add 5-10 points)
+   - ROE 10-15% = Good (neutral)
+   - ROE < 10% = Weak (subtract 5 points)
+   - Profit Margin > 20% = High quality business
+   - Debt/Equity > 2.0 = Financial risk (subtract 5 points unless in Financials sector)
+
+4. 52-WEEK RANGE MOMENTUM RULES:
+   - Within 5% of 52W High + RSI < 70 = Bullish Breakout (add 10 points)
+   - Within 5% of 52W High + RSI > 75 = Overbought Risk (subtract 5 points)
+   - Within 10% of 52W Low + Positive Consensus = Deep Value Buy (add 15 points)
+   - Within 10% of 52W Low + Negative Consensus = Falling Knife (subtract 10 points)
+
+5. TECHNICAL CONFLUENCE RULES:
+   - UPTREND + MACD Bullish + RSI 40-60 = Strong Technical Setup (add 10 points)
+   - DOWNTREND + MACD Bearish + RSI < 40 = Avoid (subtract 15 points)
+   - Bollinger Band Lower + RSI < 30 = Oversold Bounce Setup (add 10 points if fundamentals solid)
+   - Bollinger Band Upper + RSI > 70 = Overbought (subtract 5 points)
+
+6. VIX & MACRO RULES:
+   - VIX > 30 (Extreme Fear): Reduce bullish scores by 10-15 points
+     Exception: Defensive sectors (Utilities, Healthcare, Consumer Staples) immune
+   - VIX < 15 (Complacency): Add 5 points to quality stocks
+
+7. INSTITUTIONAL CONFIDENCE RULES:
+   - Insider Ownership > 15% = Strong confidence (add 5 points)
+   - Short Float > 20% = High volatility risk (flag in risk assessment)
+   - Short Float > 30% + Positive news = Potential squeeze (add 10 points to risk but note opportunity)
+
+8. DIVIDEND QUALITY RULES (for Income Stocks):
+   - Yield 3-5% + Payout Ratio < 70% = Sustainable (add 5 points)
+   - Yield > 6% + Payout Ratio > 80% = Dividend risk (subtract 5 points)
+   - No dividend for growth stocks = Neutral (don't penalize)
+
+Calculate your OBJECTIVE Market Score (0-100) based on these weighted factors and rules.
+## THESIS COMPARISON (SUBJECTIVE)
+Compare the user's thesis in each request against your score:
+1. What sentiment is the user expressing? (Bullish/Bearish/Neutral)
+2. Does it AGREE or DISAGREE with your Objective Market Score?
+3. If they disagree, explain WHY the market data suggests otherwise
+4. If they agree, validate their reasoning with specific evidence
+## OUTPUT
+{
+    "user_thesis": "Bullish" | "Bearish" | "Neutral",
+    "summary": "2-3 sentences maximum. Start with OBJECTIVE score and PRIMARY DRIVER (target upside, technical setup, or profitability). Include key factors: ROE/margins, 52W position, MACD/BB signals, sector context. Compare to user thesis. Use 'Premium Valuation' for quality growth stocks, not 'Overvaluation'.",
+    "sentiment_score": <YOUR OBJECTIVE MARKET SCORE 0-100>,
+    "risk_level": "Low" | "Medium" | "High" | "Extreme",
+    "tags": ["Tag1", "Tag2", "Tag3"]
+}
+
+CRITICAL OUTPUT RULES:
+- "sentiment_score" = Objective Market Score (0-100), user opinion does NOT influence this
+- PRIMARY DRIVERS for score (in order):
+  1. Target Price Upside vs Current Price
+  2. Technical Confluence (Trend + MACD + RSI + Bollinger Bands)
+  3. Profitability Quality (ROE, margins, growth rates)
+  4. 52-Week Range Position + Momentum
+- "summary" structure: "[Score] driven by [primary factor]. [Key supporting data]. [User comparison]."
+- Risk assessment: VIX + Short Float + Debt/Equity + Technical Breakdown + Negative Consensus
+- Growth stocks: Use Forward P/E and PEG, mention "Premium Valuation" if justified
+- Value stocks: Focus on yield, ROE, and balance sheet strength
+- Tags: Include sector, signal type, and key characteristic (e.g., "Technology", "Strong Buy", "High Growth")
+"""
+
+
+class NewsHead(NamedTuple):
+    """The only two fields of a news article the prompt uses."""
+    source: str
+    title: str
+
+
+# Accepts compacted headlines or the raw article dicts from MarketDataService
+NewsInput = Sequence[Union[NewsHead, Dict[str, str]]]
+
+# Headlines rendered into the prompt
+NEWS_HEADLINE_LIMIT = 3
+
+
+def compact_news(raw: Optional[NewsInput], limit: int = NEWS_HEADLINE_LIMIT) -> List[NewsHead]:
+    """
+    Reduce fetched news to the few (source, title) pairs the prompt renders.
+    
+    Call this where news is fetched so the full article dicts can be dropped
+    before analysis. Already-compacted input is passed through.
+    
+    Args:
+        raw: News articles as dicts or NewsHead tuples
+        limit: Maximum number of headlines to keep
+        
+    Returns:
+        Up to `limit` NewsHead tuples
+    """
+    if not raw:
+        return []
+    return [
+        n if isinstance(n, tuple) else NewsHead(n.get('source', 'Unknown'), n.get('title', ''))
+        for n in raw[:limit]
+    ]
+
+
+class SignalInput(NamedTuple):
+    """Arguments for one analyze_signal call, used by analyze_signals_batch."""
+    ticker: str
+    market_data: Dict[str, Any]
+    news: NewsInput
+    technicals: Optional[Dict[str, Any]]
+    macro_context: Optional[Dict[str, Any]] = None
+    user_post_text: Optional[str] = None
+
 
 class AIAnalysisResult(BaseModel):
     """Pydantic model for validating AI analysis output."""
@@ -33,7 +321,10 @@ class AIAnalysisResult(BaseModel):
     risk_level: str = Field(..., description="Risk level: Low, Medium, High, or Extreme")
     tags: List[str] = Field(default_factory=list, description="Analysis tags")
     
-    @validator('user_thesis')
+    model_config = ConfigDict(extra='ignore')  # Ignore extra fields from LLM
+    
+    @field_validator('user_thesis')
+    @classmethod
     def validate_user_thesis(cls, value):
         normalized_value = value.strip().capitalize()
         if normalized_value not in VALID_USER_THESIS:
@@ -41,7 +332,8 @@ class AIAnalysisResult(BaseModel):
             return DEFAULT_USER_THESIS
         return normalized_value
     
-    @validator('risk_level')
+    @field_validator('risk_level')
+    @classmethod
     def validate_risk_level(cls, value):
         normalized_value = value.strip().capitalize()
         if normalized_value not in VALID_RISK_LEVELS:
@@ -49,19 +341,22 @@ class AIAnalysisResult(BaseModel):
             return DEFAULT_RISK_LEVEL
         return normalized_value
     
-    @validator('sentiment_score')
+    # mode='before' runs ahead of int parsing and the ge/le bounds, so floats,
+    # numeric strings and out-of-range scores are coerced instead of rejected
+    @field_validator('sentiment_score', mode='before')
+    @classmethod
     def validate_sentiment_score(cls, value):
-        if isinstance(value, float):
-            value = int(round(value))
-        if not isinstance(value, int):
+        # Gemini almost always returns an int; only coerce anything else
+        if type(value) is not int:
             try:
-                value = int(float(value))
-            except (ValueError, TypeError):
+                value = round(float(value))
+            except (ValueError, TypeError, OverflowError):
                 log_warning(logger, f"Invalid sentiment_score type: {type(value)}, defaulting to {DEFAULT_SENTIMENT_SCORE}")
                 return DEFAULT_SENTIMENT_SCORE
-        return max(0, min(100, value))
+        return 0 if value < 0 else 100 if value > 100 else value
     
-    @validator('tags')
+    @field_validator('tags', mode='before')
+    @classmethod
     def validate_tags(cls, value):
         if not isinstance(value, list):
             if isinstance(value, str):
@@ -70,9 +365,339 @@ class AIAnalysisResult(BaseModel):
                 log_warning(logger, f"Invalid tags type: {type(value)}, defaulting to empty list")
                 return []
         return [str(tag) for tag in value if tag]
+
+
+class SignalResult(BaseModel):
+    """Strict schema matching the requested output format exactly (fast path)."""
+    user_thesis: Literal["Bullish", "Bearish", "Neutral"]
+    summary: str
+    sentiment_score: int = Field(..., ge=0, le=100)
+    risk_level: Literal["Low", "Medium", "High", "Extreme"]
+    tags: List[str] = Field(default_factory=list)
+
+
+# Built once per process and shared by every AIService: both the adapter and
+# the msgspec decoder compile their validation plan up front.
+# validate_json parses and validates in a single Rust-side pass.
+_SIGNAL_ADAPTER = TypeAdapter(SignalResult)
+
+if HAS_MSGSPEC:
+    class SignalStruct(msgspec.Struct):
+        """msgspec mirror of SignalResult; decodes and validates in one C pass."""
+        user_thesis: Literal["Bullish", "Bearish", "Neutral"]
+        summary: str
+        sentiment_score: Annotated[int, msgspec.Meta(ge=0, le=100)]
+        risk_level: Literal["Low", "Medium", "High", "Extreme"]
+        tags: List[str] = []
+
+    _SIGNAL_DECODER = msgspec.json.Decoder(SignalStruct)
+
+
+# Gemini response schema for one analysis. Enum fields are constrained at
+# generation time, so well-behaved output always takes the strict decode path.
+_SIGNAL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "user_thesis": {"type": "string", "enum": list(VALID_USER_THESIS)},
+        "summary": {"type": "string"},
+        "sentiment_score": {"type": "integer"},
+        "risk_level": {"type": "string", "enum": list(VALID_RISK_LEVELS)},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["user_thesis", "summary", "sentiment_score", "risk_level", "tags"],
+}
+
+# Multi-ticker responses: {"results": [{"id": ticker, ...analysis}, ...]}
+_BATCH_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": dict(_SIGNAL_RESPONSE_SCHEMA["properties"], id={"type": "string"}),
+                "required": ["id"] + _SIGNAL_RESPONSE_SCHEMA["required"],
+            },
+        },
+    },
+    "required": ["results"],
+}
+
+# Per-request generation configs for the signal model
+_SIGNAL_GENERATION_CONFIG = {"response_mime_type": "application/json", "response_schema": _SIGNAL_RESPONSE_SCHEMA}
+_BATCH_GENERATION_CONFIG = {"response_mime_type": "application/json", "response_schema": _BATCH_RESPONSE_SCHEMA}
+
+
+def _decode_strict(raw_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode a response that exactly matches the output schema.
+    
+    Uses msgspec when installed, otherwise the pydantic TypeAdapter.
+    
+    Returns:
+        Result dictionary, or None if the text is not strictly valid
+    """
+    if HAS_MSGSPEC:
+        try:
+            return msgspec.structs.asdict(_SIGNAL_DECODER.decode(raw_text))
+        except msgspec.DecodeError:
+            return None
+    try:
+        return _SIGNAL_ADAPTER.validate_json(raw_text).model_dump()
+    except ValidationError:
+        return None
+
+
+def _render_evidence(ctx: Dict[str, Any]) -> str:
+    """Render the compact evidence block, skipping fields without data."""
+    lines = [
+        f"{label}: {ctx[key]}"
+        for label, key in _EVIDENCE_FIELDS
+        if key in ctx and ctx[key] not in _EMPTY_VALUES
+    ]
+    lines.append(f"News:\n{ctx['news_summary']}")
+    return "\n".join(lines)
+
+
+def _not_available() -> str:
+    """Default for prompt fields with no data."""
+    return 'N/A'
+
+
+# (template key, market_data field) pairs, grouped by how the value is rendered
+_RAW_FIELDS = (
+    ('mcap', 'market_cap'),
+    ('pe', 'pe_ratio'),
+    ('forward_pe', 'forwardPE'),
+    ('peg', 'peg_ratio'),
+    ('pb', 'priceToBook'),
+    ('recommendation', 'recommendationKey'),
+)
+_PCT_FIELDS = (
+    ('roe', 'returnOnEquity'),
+    ('profit_margin', 'profitMargins'),
+    ('revenue_growth', 'revenueGrowth'),
+    ('earnings_growth', 'earningsGrowth'),
+    ('div_yield', 'dividendYield'),
+    ('payout_ratio', 'payoutRatio'),
+    ('short_float', 'shortPercentOfFloat'),
+    ('insider_ownership', 'heldPercentInsiders'),
+)
+_MONEY_FIELDS = (
+    ('price', 'price'),
+    ('week_52_high', 'fiftyTwoWeekHigh'),
+    ('week_52_low', 'fiftyTwoWeekLow'),
+    ('target_mean', 'targetMean'),
+)
+_NUM_FIELDS = (
+    ('debt_to_equity', 'debtToEquity'),
+    ('current_ratio', 'currentRatio'),
+)
+
+
+def _format_numeric_fields(market_datas: Sequence[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Format the numeric prompt fields for many tickers at once.
+    
+    Values are gathered into one float matrix (NaN where missing) so the
+    percentage scaling and 52-week distances run as array operations rather
+    than per-ticker Python arithmetic.
+    
+    Args:
+        market_datas: One market_data dict per ticker
+        
+    Returns:
+        Per-ticker mapping of context key to rendered string; fields
+        without data are absent
+    """
+    groups = (
+        (_PCT_FIELDS, 100.0, "{:.2f}%"),
+        (_MONEY_FIELDS, 1.0, "${:.2f}"),
+        (_NUM_FIELDS, 1.0, "{:.2f}"),
+    )
+    fields = [field for table, _, _ in groups for _, field in table]
+    arr = np.array(
+        [
+            [value if isinstance(value, (int, float)) else np.nan for value in map(md.get, fields)]
+            for md in market_datas
+        ],
+        dtype=float,
+    ).reshape(len(market_datas), len(fields))
+    
+    columns = []
+    col = 0
+    for table, scale, fmt in groups:
+        for key, _ in table:
+            columns.append((key, fmt, arr[:, col] * scale))
+            col += 1
     
-    class Config:
-        extra = 'ignore'  # Ignore extra fields from LLM
+    price = arr[:, fields.index('price')]
+    high = arr[:, fields.index('fiftyTwoWeekHigh')]
+    low = arr[:, fields.index('fiftyTwoWeekLow')]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        columns.append(('distance_from_high', "{:.1f}%", (high - price) / high * 100))
+        columns.append(('distance_from_low', "+{:.1f}%", (price - low) / low * 100))
+    
+    rows: List[Dict[str, str]] = [{} for _ in market_datas]
+    for key, fmt, values in columns:
+        for row, value in zip(rows, values.tolist()):
+            if np.isfinite(value):
+                row[key] = fmt.format(value)
+    return rows
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so existing handlers still apply
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+# Gemini errors worth retrying: rate limits, overload and server-side deadlines
+_TRANSIENT_API_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+)
+
+
+def _server_retry_delay(error: Exception) -> Optional[float]:
+    """
+    Return the retry delay the API asked for, if the error carries one.
+    
+    Gemini attaches a google.rpc.RetryInfo detail to 429 responses; its
+    retry_delay is the server's equivalent of a Retry-After header.
+    """
+    for detail in getattr(error, 'details', None) or ():
+        retry_delay = getattr(detail, 'retry_delay', None)
+        if retry_delay is not None:
+            return retry_delay.seconds + retry_delay.nanos / 1e9
+    return None
+
+
+def _backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before the next attempt.
+    
+    Uses the server-requested delay when there is one (capped at
+    AI_RETRY_DELAY_MAX), otherwise exponential backoff from
+    AI_BACKOFF_INITIAL capped at AI_BACKOFF_MAX. Up to 1s of jitter keeps
+    concurrent callers from retrying in lockstep.
+    """
+    if retry_after is not None:
+        delay = min(retry_after, AI_RETRY_DELAY_MAX)
+    else:
+        delay = min(AI_BACKOFF_INITIAL * (2 ** (attempt - 1)), AI_BACKOFF_MAX)
+    return delay + random.uniform(0, 1)
+
+
+class _JSONObjectScanner:
+    """
+    Incremental finder for the first complete top-level JSON object.
+    
+    Tracks brace depth outside of string literals, so surrounding prose,
+    code fences and braces inside strings are handled. State carries over
+    between feed() calls, so streamed text is scanned once in total rather
+    than once per chunk.
+    """
+    
+    def __init__(self):
+        self._parts: List[str] = []
+        self._offset = 0
+        self.depth = 0
+        self.start = -1
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Scan more text.
+        
+        Args:
+            chunk: Next piece of the text
+            
+        Returns:
+            The complete object once its closing brace arrives, else None
+        """
+        base = self._offset
+        self._parts.append(chunk)
+        self._offset += len(chunk)
+        for i, ch in enumerate(chunk):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                if self.start != -1:
+                    self.in_string = True
+            elif ch == '{':
+                if self.start == -1:
+                    self.start = base + i
+                self.depth += 1
+            elif ch == '}' and self.start != -1:
+                self.depth -= 1
+                if self.depth == 0:
+                    return "".join(self._parts)[self.start:base + i + 1]
+        return None
+    
+    @property
+    def scanned(self) -> int:
+        """Number of characters fed so far."""
+        return self._offset
+
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """Return the first complete top-level JSON object in text, or None."""
+    return _JSONObjectScanner().feed(text)
+
+
+def _is_complete_json(text: Optional[str]) -> bool:
+    """Check whether text holds a complete JSON object that parses."""
+    json_str = _extract_json_object(text) if text else None
+    if json_str is None:
+        return False
+    try:
+        _json_loads(json_str)
+    except ValueError:
+        return False
+    return True
+
+
+# Default JSON-mode generation config, as a hashable key for _get_model
+_JSON_CONFIG_KEY = (("response_mime_type", "application/json"),)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_model(model_name: str, cfg_key: tuple) -> genai.GenerativeModel:
+    """
+    Return a GenerativeModel for a (model, generation config) pair, built once per process.
+    
+    Args:
+        model_name: Gemini model name
+        cfg_key: Generation config as a sorted tuple of (key, value) pairs
+        
+    Returns:
+        Shared GenerativeModel instance
+    """
+    return genai.GenerativeModel(model_name=model_name, generation_config=dict(cfg_key))
+
+
+class BatchItemResult(AIAnalysisResult):
+    """One entry of a multi-ticker response, tagged with the ticker it answers."""
+    id: str = ''
+
+
+class BatchAIAnalysisResult(BaseModel):
+    """Validated multi-ticker response: {"results": [...]}."""
+    results: List[BatchItemResult]
+
+
+# Instruction prepended to multi-ticker prompts (the rules live in the system prompt)
+_BATCH_PROMPT_HEADER = """\
+Analyze each of the following %d queries independently.
+Return {"results": [{"id": "<ticker>", ...output format fields...}, ...]} with exactly one entry per query, in query order.
+
+"""
 
 
 class AIService:
@@ -80,27 +705,97 @@ class AIService:
     
     def __init__(self):
         """Initialize AI service with Google Gemini API."""
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY not found in environment variables. Required for AI analysis.")
+        api_key = _ensure_configured()
+        self._api_key = api_key
         
         # Store masked version for logging (never log actual key)
-        self._api_key_masked = f"{api_key[:8]}***MASKED***" if len(api_key) > 8 else "***MASKED***"
+        if not api_key:
+            self._api_key_masked = "***UNSET***"
+        else:
+            self._api_key_masked = f"{api_key[:8]}***MASKED***" if len(api_key) > 8 else "***MASKED***"
         
-        try:
-            genai.configure(api_key=api_key)
-        except Exception as e:
-            # Sanitize error message before logging
-            error_msg = sanitize_log_message(str(e))
-            logger.error(f"Failed to configure Gemini API: {error_msg}")
-            raise ValueError(f"Failed to configure Gemini API: {error_msg}")
+        # Generic model for free-form prompts (batch insight population)
+        self.model = _get_model(GEMINI_MODEL_NAME, _JSON_CONFIG_KEY)
+        
+        # Signal model carries the static CIO instructions as a (cached) system prompt
+        self._context_cache = None
+        self._context_cache_expires_at = 0.0
+        # Serializes context-cache rebuilds so concurrent callers create one cache
+        self._signal_model_lock = threading.Lock()
+        self.signal_model = self._build_signal_model()
         
-        self.model = genai.GenerativeModel(
-            model_name='gemini-2.5-flash',
-            generation_config={"response_mime_type": "application/json"}
+        # Result cache: in-memory LRU for hot tickers in front of the disk cache
+        self.cache = TieredCache(
+            TTLCache(maxsize=AI_MEMORY_CACHE_SIZE, ttl=AI_MEMORY_CACHE_TTL),
+            FileCache(AI_CACHE_DIR, default_ttl=CACHE_TTL_AI_SIGNAL)
         )
+        
+        # In-flight async analyses by (event loop, cache key), so concurrent
+        # requests for the same prompt share one Gemini call
+        self._inflight: Dict[tuple, asyncio.Future] = {}
         logger.info("AI service initialized with Gemini 2.5 Flash")
 
+    def _build_signal_model(self) -> genai.GenerativeModel:
+        """
+        Build the model used by analyze_signal.
+        
+        Uploads the static system prompt to Gemini context caching so it is
+        billed and prefilled once per TTL. Falls back to sending the system
+        instruction inline when caching is unavailable (e.g. prompt below the
+        model's minimum cacheable size or API quota).
+        
+        Returns:
+            GenerativeModel configured with the static CIO instructions
+        """
+        generation_config = _SIGNAL_GENERATION_CONFIG
+        try:
+            if not self._api_key:
+                raise RuntimeError("Gemini API not configured")
+            self._context_cache = caching.CachedContent.create(
+                model=f"models/{GEMINI_MODEL_NAME}",
+                display_name="stockread-cio-system-prompt",
+                system_instruction=_STATIC_SYSTEM_PROMPT,
+                ttl=timedelta(seconds=AI_CONTEXT_CACHE_TTL)
+            )
+            # Refresh slightly before the server-side expiry
+            self._context_cache_expires_at = time.time() + AI_CONTEXT_CACHE_TTL - 60
+            logger.info("Gemini context cache created for static system prompt")
+            return genai.GenerativeModel.from_cached_content(
+                cached_content=self._context_cache,
+                generation_config=generation_config
+            )
+        except Exception as e:
+            error_msg = sanitize_log_message(str(e))
+            logger.warning("Gemini context caching unavailable, sending system prompt inline: %s", error_msg)
+            self._context_cache = None
+            self._context_cache_expires_at = 0.0
+            return genai.GenerativeModel(
+                model_name=GEMINI_MODEL_NAME,
+                system_instruction=_STATIC_SYSTEM_PROMPT,
+                generation_config=generation_config
+            )
+    
+    def _get_signal_model(self) -> genai.GenerativeModel:
+        """Return the signal model, recreating the context cache once its TTL has elapsed."""
+        if self._context_cache is not None and time.time() >= self._context_cache_expires_at:
+            with self._signal_model_lock:
+                # Another caller may have rebuilt it while we waited for the lock
+                if self._context_cache is not None and time.time() >= self._context_cache_expires_at:
+                    logger.info("Gemini context cache expired, recreating")
+                    self.signal_model = self._build_signal_model()
+        return self.signal_model
+    
+    def _rebuild_signal_model(self, stale_model: genai.GenerativeModel) -> None:
+        """
+        Replace a signal model whose context cache was evicted server-side.
+        
+        Only the first caller to report stale_model rebuilds it; concurrent
+        callers that failed on the same model reuse the replacement.
+        """
+        with self._signal_model_lock:
+            if self.signal_model is stale_model:
+                self.signal_model = self._build_signal_model()
+    
     def _calculate_risk_from_score(self, sentiment_score: int) -> str:
         """
         Calculate risk level based on sentiment score.
@@ -123,11 +818,217 @@ class AIService:
         else:
             return "High"
     
+    def _build_prompt_context(
+        self,
+        ticker: str,
+        market_data: Dict[str, Any],
+        news: NewsInput,
+        technicals: Optional[Dict[str, Any]],
+        macro_context: Optional[Dict[str, Any]] = None,
+        user_post_text: Optional[str] = None,
+        numbers: Optional[Dict[str, str]] = None
+    ) -> DefaultDict[str, Any]:
+        """
+        Collect every prompt substitution for one ticker.
+        
+        Args:
+            ticker: Stock ticker symbol
+            market_data: Dictionary with price and fundamental data
+            news: News headlines (NewsHead tuples or raw article dicts)
+            technicals: Dictionary with technical indicators
+            macro_context: Dictionary with VIX and market sentiment
+            user_post_text: User's thesis/post text
+            numbers: Precomputed _format_numeric_fields row for this ticker
+            
+        Returns:
+            Context mapping for _PROMPT_TEMPLATE, including the rendered evidence
+        """
+        # Missing fields render as N/A through the defaultdict
+        ctx = defaultdict(_not_available)
+        ctx['ticker'] = ticker
+        ctx['sector'] = market_data.get('sector')
+        ctx['industry'] = market_data.get('industry')
+        ctx['news_summary'] = (
+            "\n".join(f"- [{source}] {title}" for source, title in compact_news(news))
+            if news else "No recent news."
+        )
+        ctx['user_thesis_text'] = user_post_text if user_post_text else "No user thesis provided."
+        
+        for key, field in _RAW_FIELDS:
+            value = market_data.get(field)
+            if value is not None and value != '':
+                ctx[key] = value
+        ctx.update(numbers if numbers is not None else _format_numeric_fields([market_data])[0])
+        
+        # Technical Analysis (Enhanced)
+        if technicals:
+            ctx['tech_trend'] = technicals.get('trend')
+            if technicals.get('rsi') is not None:
+                ctx['tech_rsi'] = f"{technicals['rsi']} ({technicals.get('rsi_signal', 'N/A')})"
+            ctx['macd_trend'] = technicals.get('macd_trend')
+            ctx['bb_position'] = technicals.get('bb_position')
+        
+        # Macro Context
+        if macro_context:
+            ctx['vix_value'] = macro_context.get('vix')
+            ctx['vix_status'] = macro_context.get('market_sentiment')
+        
+        ctx['evidence'] = _render_evidence(ctx)
+        return ctx
+    
+    def _insufficient_data_result(
+        self,
+        ticker: str,
+        market_data: Optional[Dict[str, Any]],
+        news: Optional[NewsInput],
+        technicals: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a neutral result when there is nothing to analyze.
+        
+        Only triggers when price, news and technicals are ALL missing, so
+        thinly covered tickers with any real data still reach the model.
+        
+        Args:
+            ticker: Stock ticker symbol
+            market_data: Dictionary with price and fundamental data
+            news: News headlines (NewsHead tuples or raw article dicts)
+            technicals: Dictionary with technical indicators
+            
+        Returns:
+            Deterministic "insufficient data" result, or None if analysis should proceed
+        """
+        has_price = bool(market_data) and market_data.get('price') not in (None, 'N/A')
+        if has_price or news or technicals:
+            return None
+        
+        logger.info("Skipping AI analysis for %s: no price, news or technicals available", ticker)
+        return self._placeholder_result()
+    
+    def _placeholder_result(self) -> Dict[str, Any]:
+        """Neutral result returned when a ticker has no data to analyze."""
+        return {
+            'user_thesis': DEFAULT_USER_THESIS,
+            'summary': 'Insufficient market data available.',
+            'sentiment_score': DEFAULT_SENTIMENT_SCORE,
+            'risk_level': DEFAULT_RISK_LEVEL,
+            'tags': ['NoData']
+        }
+    
+    def _signal_cache_key(self, prompt: str) -> str:
+        """
+        Build the result-cache key for one rendered signal prompt.
+        
+        Keying on the prompt rather than the raw inputs means inputs that
+        render identically (e.g. market_data fields the prompt never shows)
+        share one cached result, while a different user thesis never does.
+        """
+        return make_cache_key({'model': GEMINI_MODEL_NAME, 'prompt': prompt})
+    
+    def _build_signal_prompt(
+        self,
+        ticker: str,
+        market_data: Dict[str, Any],
+        news: NewsInput,
+        technicals: Optional[Dict[str, Any]],
+        macro_context: Optional[Dict[str, Any]],
+        user_post_text: Optional[str],
+        numbers: Optional[Dict[str, str]] = None
+    ) -> Optional[str]:
+        """
+        Build the per-ticker prompt (evidence + user thesis) sent with the system prompt.
+        
+        Oversized prompts (almost always a huge user thesis) are retried with
+        the thesis cut to its last AI_THESIS_TRUNCATE_CHARS characters.
+        
+        Returns:
+            Prompt text, or None if it stays above AI_MAX_PROMPT_TOKENS
+        """
+        ctx = self._build_prompt_context(
+            ticker, market_data, news, technicals, macro_context, user_post_text, numbers
+        )
+        prompt = _PROMPT_TEMPLATE.format_map(ctx)
+        
+        # ~4 characters per token is close enough to bound spend without an RPC
+        if len(prompt) // 4 <= AI_MAX_PROMPT_TOKENS:
+            return prompt
+        
+        logger.warning("Prompt for %s is ~%s tokens, truncating user thesis", ticker, len(prompt) // 4)
+        ctx['user_thesis_text'] = ctx['user_thesis_text'][-AI_THESIS_TRUNCATE_CHARS:]
+        prompt = _PROMPT_TEMPLATE.format_map(ctx)
+        if len(prompt) // 4 <= AI_MAX_PROMPT_TOKENS:
+            return prompt
+        
+        logger.warning("Prompt for %s still exceeds %s tokens after truncation, skipping", ticker, AI_MAX_PROMPT_TOKENS)
+        return None
+    
+    def _process_response(self, raw_text: str, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Turn raw model output into a validated analysis result.
+        
+        Well-formed JSON that already matches the strict schema is parsed and
+        validated in one pass, including when it is wrapped in code fences or
+        prose; anything else goes through the lenient multi-strategy parser
+        and normalizing validators.
+        
+        Args:
+            raw_text: Raw text response from LLM
+            ticker: Ticker symbol for logging
+            
+        Returns:
+            Validated dictionary or None if the response is unusable
+        """
+        result = _decode_strict(raw_text)
+        if result is None:
+            json_str = _extract_json_object(raw_text)
+            if json_str is not None and len(json_str) != len(raw_text):
+                result = _decode_strict(json_str)
+        if result is not None:
+            result['risk_level'] = self._calculate_risk_from_score(result['sentiment_score'])
+            logger.info("Successfully analyzed %s (score=%s, risk=%s)", ticker, result['sentiment_score'], result['risk_level'])
+            return result
+        logger.debug("Strict parse failed for %s, using fallback parser", ticker)
+        
+        parsed_result = self._parse_llm_response(raw_text, ticker)
+        if not parsed_result:
+            return None
+        return self._finalize_result(parsed_result, ticker)
+    
+    def _finalize_result(self, parsed_result: Dict[str, Any], ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Apply score-derived risk and schema validation to a parsed LLM result.
+        
+        Args:
+            parsed_result: Parsed dictionary from LLM
+            ticker: Ticker symbol for logging
+            
+        Returns:
+            Validated dictionary or None if validation fails
+        """
+        # Calculate risk level based on sentiment score (inverse relationship)
+        # High score = Low risk, Low score = High risk
+        try:
+            sentiment_score = round(float(parsed_result.get('sentiment_score', 50)))
+        except (TypeError, ValueError, OverflowError):
+            # Null or non-numeric score: drop this result rather than the whole batch
+            logger.warning("Invalid sentiment_score for %s: %r", ticker, parsed_result.get('sentiment_score'))
+            return None
+        calculated_risk = self._calculate_risk_from_score(sentiment_score)
+        
+        # Override AI's risk level with score-based calculation for consistency
+        parsed_result['risk_level'] = calculated_risk
+        
+        # Validate with Pydantic schema
+        validated_result = self._validate_analysis_result(parsed_result, ticker)
+        if validated_result:
+            logger.info("Successfully analyzed %s (score=%s, risk=%s)", ticker, sentiment_score, calculated_risk)
+        return validated_result
+    
     def analyze_signal(
         self, 
         ticker: str, 
         market_data: Dict[str, Any], 
-        news: List[Dict[str, str]],
+        news: NewsInput,
         technicals: Optional[Dict[str, Any]], 
         macro_context: Optional[Dict[str, Any]] = None,
         user_post_text: Optional[str] = None
@@ -139,318 +1040,277 @@ class AIService:
         Args:
             ticker: Stock ticker symbol
             market_data: Dictionary with price and fundamental data
-            news: List of news articles
+            news: News headlines (NewsHead tuples or raw article dicts)
             technicals: Dictionary with technical indicators
             macro_context: Dictionary with VIX and market sentiment (Milestone 19)
             user_post_text: User's thesis/post text (analyzed separately)
             
         Returns:
-            Dictionary with analysis results including sentiment score and risk level
+            Dictionary with analysis results including sentiment score and risk level,
+            or None if analysis failed or the prompt exceeds AI_MAX_PROMPT_TOKENS
         """
-        news_summary = "No recent news."
-        if news and len(news) > 0:
-            news_summary = "\n".join([
-                f"- [{n.get('source', 'Unknown')}] {n.get('title', '')}" 
-                for n in news[:3]
-            ])
-
-        user_thesis_text = user_post_text if user_post_text else "No user thesis provided."
+        no_data_result = self._insufficient_data_result(ticker, market_data, news, technicals)
+        if no_data_result is not None:
+            return no_data_result
         
-        # Technical Analysis (Enhanced)
-        tech_trend = technicals.get('trend', 'Unknown') if technicals else 'Unknown'
-        tech_rsi = (
-            f"{technicals.get('rsi', 'N/A')} ({technicals.get('rsi_signal', 'N/A')})" 
-            if technicals else 'N/A'
-        )
-        macd_trend = technicals.get('macd_trend', 'N/A') if technicals else 'N/A'
-        bb_position = technicals.get('bb_position', 'N/A') if technicals else 'N/A'
-        
-        # Price & Fundamentals
-        price = market_data.get('price', 'N/A')
-        mcap = market_data.get('market_cap', 'N/A')
-        pe = market_data.get('pe_ratio', 'N/A')
-        forward_pe = market_data.get('forwardPE', 'N/A')
-        peg = market_data.get('peg_ratio', 'N/A')
-        pb = market_data.get('priceToBook', 'N/A')
-        
-        # Profitability & Growth (STEP 1)
-        roe = market_data.get('returnOnEquity', None)
-        profit_margin = market_data.get('profitMargins', None)
-        revenue_growth = market_data.get('revenueGrowth', None)
-        earnings_growth = market_data.get('earningsGrowth', None)
-        
-        # Financial Health (STEP 1)
-        debt_to_equity = market_data.get('debtToEquity', None)
-        current_ratio = market_data.get('currentRatio', None)
-        
-        # 52-Week Range (STEP 4)
-        week_52_high = market_data.get('fiftyTwoWeekHigh', None)
-        week_52_low = market_data.get('fiftyTwoWeekLow', None)
-        distance_from_high = None
-        distance_from_low = None
-        if week_52_high and isinstance(price, (int, float)):
-            distance_from_high = ((week_52_high - price) / week_52_high) * 100
-        if week_52_low and isinstance(price, (int, float)):
-            distance_from_low = ((price - week_52_low) / week_52_low) * 100
-        
-        # Dividend (STEP 5)
-        div_yield = market_data.get('dividendYield', None)
-        payout_ratio = market_data.get('payoutRatio', None)
-        
-        # Sector Context (STEP 3)
-        sector = market_data.get('sector', 'Unknown')
-        industry = market_data.get('industry', 'Unknown')
-        
-        # Institutional Data
-        target_mean = market_data.get('targetMean', None)
-        recommendation = market_data.get('recommendationKey', None)
-        short_float = market_data.get('shortPercentOfFloat', None)
-        insider_ownership = market_data.get('heldPercentInsiders', None)
+        prompt = self._build_signal_prompt(ticker, market_data, news, technicals, macro_context, user_post_text)
+        if prompt is None:
+            # Too large to send even with a truncated thesis; not a "no data" case
+            return None
         
-        # Macro Context
-        vix_status = "Unknown"
-        vix_value = "N/A"
-        if macro_context:
-            vix_value = macro_context.get('vix', 'N/A')
-            vix_status = macro_context.get('market_sentiment', 'Unknown')
-
-        prompt = f"""
-        You are the Chief Investment Officer AI for 'Stock Read'.
-        Your job is to provide an OBJECTIVE market analysis for {ticker}, then compare it to the user's thesis.
-        
-        ═══════════════════════════════════════════════════════════════════════════
-        SECTION 1: THE EVIDENCE (100% OBJECTIVE - NO USER BIAS)
-        ═══════════════════════════════════════════════════════════════════════════
-        
-        MACRO CONTEXT:
-        - Market Mood: {vix_status} (VIX: {vix_value})
-        
-        SECTOR & INDUSTRY:
-        - Sector: {sector}
-        - Industry: {industry}
-        
-        VALUATION & FUNDAMENTALS:
-        - Current Price: ${price}
-        - Market Cap: {mcap}
-        - Trailing P/E: {pe}
-        - Forward P/E: {forward_pe}
-        - PEG Ratio: {peg}
-        - Price/Book: {pb}
-        
-        PROFITABILITY & GROWTH:
-        - Return on Equity: {(roe * 100) if roe else 'N/A'}%
-        - Profit Margin: {(profit_margin * 100) if profit_margin else 'N/A'}%
-        - Revenue Growth: {(revenue_growth * 100) if revenue_growth else 'N/A'}%
-        - Earnings Growth: {(earnings_growth * 100) if earnings_growth else 'N/A'}%
-        
-        FINANCIAL HEALTH:
-        - Debt/Equity: {debt_to_equity if debt_to_equity else 'N/A'}
-        - Current Ratio: {current_ratio if current_ratio else 'N/A'}
-        
-        DIVIDEND (if applicable):
-        - Dividend Yield: {(div_yield * 100) if div_yield else 'N/A'}%
-        - Payout Ratio: {(payout_ratio * 100) if payout_ratio else 'N/A'}%
-        
-        52-WEEK RANGE ANALYSIS:
-        - 52W High: ${week_52_high if week_52_high else 'N/A'}
-        - 52W Low: ${week_52_low if week_52_low else 'N/A'}
-        - Distance from High: {round(distance_from_high, 1) if distance_from_high else 'N/A'}%
-        - Distance from Low: +{round(distance_from_low, 1) if distance_from_low else 'N/A'}%
-        
-        INSTITUTIONAL DATA (Wall Street Intelligence):
-        - Analyst Target: ${target_mean if target_mean else 'N/A'}
-        - Analyst Consensus: {recommendation if recommendation else 'N/A'}
-        - Short Float: {(short_float * 100) if short_float else 'N/A'}%
-        - Insider Ownership: {(insider_ownership * 100) if insider_ownership else 'N/A'}%
-        
-        TECHNICAL ANALYSIS (Enhanced):
-        - Trend: {tech_trend}
-        - RSI: {tech_rsi}
-        - MACD Signal: {macd_trend}
-        - Bollinger Band Position: {bb_position}
-        
-        NEWS HEADLINES:
-        {news_summary}
-        
-        ═══════════════════════════════════════════════════════════════════════════
-        OBJECTIVE MARKET SCORE CALCULATION (DO NOT LET USER INFLUENCE THIS)
-        ═══════════════════════════════════════════════════════════════════════════
-        
-        Weight the evidence as follows:
-        - Fundamentals & Profitability: 15% (P/E, ROE, margins, growth rates)
-        - Technicals: 25% (trend, RSI, MACD, Bollinger Bands)
-        - News Sentiment: 20% (headline sentiment)
-        - Institutional/Consensus: 40% (analyst target, ratings, institutional holdings) - PRIMARY DRIVER
-        
-        Apply these OBJECTIVE RULES:
-        
-        1. TARGET PRICE UPSIDE RULE (PRIMARY SCORE DRIVER):
-           - 15%+ below target → Score 70-85 (Strong Buy)
-           - 10-15% below target → Score 65-75 (Buy)
-           - 5-10% below target → Score 55-65 (Hold/Accumulate)
-           - At or above target → Score 40-55 (Hold/Trim)
-           - Target price upside OVERRIDES valuation concerns when consensus is Buy/Strong Buy
-        
-        2. VALUATION CONTEXT RULES:
-           a) MAGNIFICENT 7 PREMIUM (NVDA, AAPL, MSFT, AMZN, GOOGL, META, TSLA):
-              - P/E 25-50 is NORMAL if consensus is Buy/Strong Buy
-              - Call it "Premium Valuation" NOT "Overvaluation"
-              - PEG < 2.0 validates premium multiples
-           
-           b) GROWTH STOCKS (Revenue Growth > 20%):
-              - Forward P/E more important than trailing P/E
-              - PEG Ratio < 1.5 = Attractive, even if P/E seems high
-              - Strong earnings growth (>25%) justifies P/E up to 40
-           
-           c) VALUE STOCKS (P/E < 15, Dividend Yield > 3%):
-              - Focus on ROE, profit margins, debt levels
-              - Current Ratio > 1.5 = Strong balance sheet
-              - Dividend yield + payout ratio sustainability matters
-           
-           d) SECTOR-RELATIVE VALUATION:
-              - Tech: P/E 20-35 is normal
-              - Healthcare/Pharma: P/E 15-25 is normal
-              - Utilities/REITs: Focus on dividend yield (3-5%)
-              - Financials: Use P/B ratio, target < 1.5
-        
-        3. PROFITABILITY QUALITY RULES:
-           - ROE > 15% = Excellent (add 5-10 points)
-           - ROE 10-15% = Good (neutral)
-           - ROE < 10% = Weak (subtract 5 points)
-           - Profit Margin > 20% = High quality business
-           - Debt/Equity > 2.0 = Financial risk (subtract 5 points unless in Financials sector)
-        
-        4. 52-WEEK RANGE MOMENTUM RULES:
-           - Within 5% of 52W High + RSI < 70 = Bullish Breakout (add 10 points)
-           - Within 5% of 52W High + RSI > 75 = Overbought Risk (subtract 5 points)
-           - Within 10% of 52W Low + Positive Consensus = Deep Value Buy (add 15 points)
-           - Within 10% of 52W Low + Negative Consensus = Falling Knife (subtract 10 points)
-        
-        5. TECHNICAL CONFLUENCE RULES:
-           - UPTREND + MACD Bullish + RSI 40-60 = Strong Technical Setup (add 10 points)
-           - DOWNTREND + MACD Bearish + RSI < 40 = Avoid (subtract 15 points)
-           - Bollinger Band Lower + RSI < 30 = Oversold Bounce Setup (add 10 points if fundamentals solid)
-           - Bollinger Band Upper + RSI > 70 = Overbought (subtract 5 points)
-        
-        6. VIX & MACRO RULES:
-           - VIX > 30 (Extreme Fear): Reduce bullish scores by 10-15 points
-             Exception: Defensive sectors (Utilities, Healthcare, Consumer Staples) immune
-           - VIX < 15 (Complacency): Add 5 points to quality stocks
-        
-        7. INSTITUTIONAL CONFIDENCE RULES:
-           - Insider Ownership > 15% = Strong confidence (add 5 points)
-           - Short Float > 20% = High volatility risk (flag in risk assessment)
-           - Short Float > 30% + Positive news = Potential squeeze (add 10 points to risk but note opportunity)
-        
-        8. DIVIDEND QUALITY RULES (for Income Stocks):
-           - Yield 3-5% + Payout Ratio < 70% = Sustainable (add 5 points)
-           - Yield > 6% + Payout Ratio > 80% = Dividend risk (subtract 5 points)
-           - No dividend for growth stocks = Neutral (don't penalize)
-        
-        Calculate your OBJECTIVE Market Score (0-100) based on these weighted factors and rules.
-        
-        ═══════════════════════════════════════════════════════════════════════════
-        💭 SECTION 2: USER THESIS COMPARISON (SUBJECTIVE ANALYSIS)
-        ═══════════════════════════════════════════════════════════════════════════
-        
-        User's Thesis:
-        "{user_thesis_text}"
-        
-        Now compare:
-        1. What sentiment is the user expressing? (Bullish/Bearish/Neutral)
-        2. Does it AGREE or DISAGREE with your Objective Market Score?
-        3. If they disagree, explain WHY the market data suggests otherwise
-        4. If they agree, validate their reasoning with specific evidence
-        
-        ═══════════════════════════════════════════════════════════════════════════
-        📤 OUTPUT FORMAT
-        ═══════════════════════════════════════════════════════════════════════════
-        
-        {{
-            "user_thesis": "Bullish" | "Bearish" | "Neutral",
-            "summary": "2-3 sentences maximum. Start with OBJECTIVE score and PRIMARY DRIVER (target upside, technical setup, or profitability). Include key factors: ROE/margins, 52W position, MACD/BB signals, sector context. Compare to user thesis. Use 'Premium Valuation' for quality growth stocks, not 'Overvaluation'.",
-            "sentiment_score": <YOUR OBJECTIVE MARKET SCORE 0-100>,
-            "risk_level": "Low" | "Medium" | "High" | "Extreme",
-            "tags": ["Tag1", "Tag2", "Tag3"]
-        }}
-        
-        CRITICAL OUTPUT RULES:
-        - "sentiment_score" = Objective Market Score (0-100), user opinion does NOT influence this
-        - PRIMARY DRIVERS for score (in order):
-          1. Target Price Upside vs Current Price
-          2. Technical Confluence (Trend + MACD + RSI + Bollinger Bands)
-          3. Profitability Quality (ROE, margins, growth rates)
-          4. 52-Week Range Position + Momentum
-        - "summary" structure: "[Score] driven by [primary factor]. [Key supporting data]. [User comparison]."
-        - Risk assessment: VIX + Short Float + Debt/Equity + Technical Breakdown + Negative Consensus
-        - Growth stocks: Use Forward P/E and PEG, mention "Premium Valuation" if justified
-        - Value stocks: Focus on yield, ROE, and balance sheet strength
-        - Tags: Include sector, signal type, and key characteristic (e.g., "Technology", "Strong Buy", "High Growth")
-        """
+        cache_key = self._signal_cache_key(prompt)
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            logger.info("Cache hit for %s analysis", ticker)
+            return cached_result
 
         max_retries = 2
         for attempt in range(max_retries):
             try:
-                # Use ThreadPoolExecutor to add timeout to the API call
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(self.model.generate_content, prompt)
-                    try:
-                        response = future.result(timeout=AI_API_TIMEOUT)
-                        raw_text = response.text
-                    except FutureTimeoutError:
-                        logger.error(f"AI API call timeout for {ticker} after {AI_API_TIMEOUT}s (attempt {attempt + 1}/{max_retries})")
-                        if attempt < max_retries - 1:
-                            continue
-                        else:
-                            return None
-                    except Exception as api_error:
-                        error_msg = sanitize_log_message(str(api_error))
-                        logger.warning(f"AI API call error for {ticker} (attempt {attempt + 1}/{max_retries}): {error_msg}")
-                        if attempt < max_retries - 1:
-                            continue
-                        else:
-                            return None
-                
-                # Attempt to parse JSON with fallback strategies
-                parsed_result = self._parse_llm_response(raw_text, ticker)
+                # Transient API errors are retried with backoff inside the helper
+                raw_text = self._generate_with_backoff(prompt, ticker)
+                if raw_text is None:
+                    return None
                 
-                if parsed_result:
-                    # Calculate risk level based on sentiment score (inverse relationship)
-                    # High score = Low risk, Low score = High risk
-                    sentiment_score = int(parsed_result.get('sentiment_score', 50))
-                    calculated_risk = self._calculate_risk_from_score(sentiment_score)
-                    
-                    # Override AI's risk level with score-based calculation for consistency
-                    parsed_result['risk_level'] = calculated_risk
-                    
-                    # Validate with Pydantic schema
-                    validated_result = self._validate_analysis_result(parsed_result, ticker)
-                    if validated_result:
-                        logger.info(f"Successfully analyzed {ticker} (score={sentiment_score}, risk={calculated_risk})")
-                        return validated_result
+                # Typed fast path, then JSON fallback strategies
+                validated_result = self._process_response(raw_text, ticker)
+                if validated_result:
+                    self.cache.set(cache_key, validated_result)
+                    return validated_result
                 
                 # If we get here, parsing/validation failed
                 if attempt < max_retries - 1:
-                    logger.warning(f"Retry {attempt + 1}/{max_retries} for {ticker} after parse failure")
+                    logger.warning("Retry %s/%s for %s after parse failure", attempt + 1, max_retries, ticker)
                     continue
                 else:
-                    logger.error(f"AI analysis failed for {ticker} after {max_retries} attempts: Invalid response format")
+                    logger.error("AI analysis failed for %s after %s attempts: Invalid response format", ticker, max_retries)
                     return None
                     
             except Exception as e:
                 error_msg = sanitize_log_message(str(e))
                 if attempt < max_retries - 1:
-                    logger.warning(f"Retry {attempt + 1}/{max_retries} for {ticker} after error: {error_msg}")
+                    logger.warning("Retry %s/%s for %s after error: %s", attempt + 1, max_retries, ticker, error_msg)
                     continue
                 else:
-                    logger.error(f"AI analysis failed for {ticker} after {max_retries} attempts: {error_msg}")
+                    logger.error("AI analysis failed for %s after %s attempts: %s", ticker, max_retries, error_msg)
+                    return None
+        
+        return None
+    
+    def _generate_with_backoff(
+        self,
+        prompt: str,
+        ticker: str,
+        generation_config: Dict[str, Any] = _SIGNAL_GENERATION_CONFIG
+    ) -> Optional[str]:
+        """
+        Call the signal model, retrying transient failures with exponential backoff.
+        
+        Each call carries an AI_API_TIMEOUT deadline, so a hung request is
+        aborted by the transport rather than left running. Rate limits, 503s
+        and deadline errors are retried with jittered exponential delays, or
+        after the delay a 429 asks for.
+        Permanent errors such as InvalidArgument
+        (bad prompt) fail immediately.
+        
+        Args:
+            prompt: Per-ticker prompt
+            ticker: Ticker symbol for logging
+            generation_config: Response format (single analysis by default)
+            
+        Returns:
+            Raw response text, or None if the call ultimately failed
+        """
+        for attempt in range(1, AI_TRANSIENT_MAX_ATTEMPTS + 1):
+            retry_after = None
+            model = self._get_signal_model()
+            try:
+                response = model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    request_options={"timeout": AI_API_TIMEOUT}
+                )
+                return response.text
+            except _TRANSIENT_API_ERRORS as api_error:
+                error_msg = sanitize_log_message(str(api_error))
+                logger.warning("Transient AI API error for %s (attempt %s/%s): %s", ticker, attempt, AI_TRANSIENT_MAX_ATTEMPTS, error_msg)
+                retry_after = _server_retry_delay(api_error)
+            except google_exceptions.NotFound as api_error:
+                if self._context_cache is None:
+                    logger.error("AI API call failed for %s: %s", ticker, sanitize_log_message(str(api_error)))
                     return None
+                # Cached content was evicted server-side; rebuild before retrying
+                logger.warning("Gemini context cache not found, recreating")
+                self._rebuild_signal_model(model)
+                continue
+            except Exception as api_error:
+                error_msg = sanitize_log_message(str(api_error))
+                logger.error("AI API call failed for %s (not retryable): %s", ticker, error_msg)
+                return None
+            
+            if attempt < AI_TRANSIENT_MAX_ATTEMPTS:
+                time.sleep(_backoff_delay(attempt, retry_after))
         
+        logger.error("AI API call for %s failed after %s attempts", ticker, AI_TRANSIENT_MAX_ATTEMPTS)
         return None
     
+    async def analyze_signal_async(
+        self, 
+        ticker: str, 
+        market_data: Dict[str, Any], 
+        news: NewsInput,
+        technicals: Optional[Dict[str, Any]], 
+        macro_context: Optional[Dict[str, Any]] = None,
+        user_post_text: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of analyze_signal for analyzing many tickers concurrently.
+        
+        Uses the SDK's async transport, which keeps one shared channel per
+        process, so concurrent calls reuse the same connection instead of
+        opening a new one per request. Concurrent calls that render the same
+        prompt share a single in-flight Gemini request.
+        
+        Args:
+            ticker: Stock ticker symbol
+            market_data: Dictionary with price and fundamental data
+            news: News headlines (NewsHead tuples or raw article dicts)
+            technicals: Dictionary with technical indicators
+            macro_context: Dictionary with VIX and market sentiment
+            user_post_text: User's thesis/post text (analyzed separately)
+            
+        Returns:
+            Dictionary with analysis results, or None on failure
+        """
+        no_data_result = self._insufficient_data_result(ticker, market_data, news, technicals)
+        if no_data_result is not None:
+            return no_data_result
+        
+        prompt = self._build_signal_prompt(ticker, market_data, news, technicals, macro_context, user_post_text)
+        if prompt is None:
+            # Too large to send even with a truncated thesis; not a "no data" case
+            return None
+        
+        cache_key = self._signal_cache_key(prompt)
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            logger.info("Cache hit for %s analysis", ticker)
+            return cached_result
+        
+        # Futures belong to one event loop, so only coalesce within the same loop
+        inflight_key = (asyncio.get_running_loop(), cache_key)
+        task = self._inflight.get(inflight_key)
+        if task is not None:
+            logger.info("Joining in-flight analysis for %s", ticker)
+        else:
+            task = asyncio.ensure_future(self._run_signal_async(prompt, ticker, cache_key))
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        
+        # Shield so one cancelled caller does not cancel the call for the others
+        return await asyncio.shield(task)
+    
+    async def _run_signal_async(self, prompt: str, ticker: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Generate, parse and cache one signal analysis (cache already missed).
+        
+        Args:
+            prompt: Per-ticker prompt
+            ticker: Ticker symbol for logging
+            cache_key: Result-cache key for prompt
+            
+        Returns:
+            Validated analysis result, or None on failure
+        """
+        max_retries = 2
+        for attempt in range(max_retries):
+            raw_text = await self._generate_with_backoff_async(prompt, ticker)
+            if raw_text is None:
+                return None
+            
+            validated_result = self._process_response(raw_text, ticker)
+            if validated_result:
+                self.cache.set(cache_key, validated_result)
+                return validated_result
+            logger.warning("Retry %s/%s for %s after parse failure", attempt + 1, max_retries, ticker)
+        
+        logger.error("AI analysis failed for %s after %s attempts: Invalid response format", ticker, max_retries)
+        return None
+    
+    async def _generate_with_backoff_async(self, prompt: str, ticker: str) -> Optional[str]:
+        """
+        Async counterpart of _generate_with_backoff; waits with asyncio.sleep between attempts.
+        
+        Args:
+            prompt: Per-ticker prompt
+            ticker: Ticker symbol for logging
+            
+        Returns:
+            Raw response text, or None if the call ultimately failed
+        """
+        for attempt in range(1, AI_TRANSIENT_MAX_ATTEMPTS + 1):
+            retry_after = None
+            model = self._get_signal_model()
+            try:
+                response = await asyncio.wait_for(
+                    model.generate_content_async(prompt),
+                    timeout=AI_API_TIMEOUT
+                )
+                return response.text
+            except asyncio.TimeoutError:
+                logger.warning("AI API call timeout for %s after %ss (attempt %s/%s)", ticker, AI_API_TIMEOUT, attempt, AI_TRANSIENT_MAX_ATTEMPTS)
+            except _TRANSIENT_API_ERRORS as api_error:
+                error_msg = sanitize_log_message(str(api_error))
+                logger.warning("Transient AI API error for %s (attempt %s/%s): %s", ticker, attempt, AI_TRANSIENT_MAX_ATTEMPTS, error_msg)
+                retry_after = _server_retry_delay(api_error)
+            except google_exceptions.NotFound as api_error:
+                if self._context_cache is None:
+                    logger.error("AI API call failed for %s: %s", ticker, sanitize_log_message(str(api_error)))
+                    return None
+                logger.warning("Gemini context cache not found, recreating")
+                self._rebuild_signal_model(model)
+                continue
+            except Exception as api_error:
+                error_msg = sanitize_log_message(str(api_error))
+                logger.error("AI API call failed for %s (not retryable): %s", ticker, error_msg)
+                return None
+            
+            if attempt < AI_TRANSIENT_MAX_ATTEMPTS:
+                await asyncio.sleep(_backoff_delay(attempt, retry_after))
+        
+        logger.error("AI API call for %s failed after %s attempts", ticker, AI_TRANSIENT_MAX_ATTEMPTS)
+        return None
+    
+    async def analyze_signal_threaded(
+        self, 
+        ticker: str, 
+        market_data: Dict[str, Any], 
+        news: NewsInput,
+        technicals: Optional[Dict[str, Any]], 
+        macro_context: Optional[Dict[str, Any]] = None,
+        user_post_text: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run the blocking analyze_signal in a worker thread.
+        
+        For async callers (e.g. FastAPI handlers) that must not block the
+        event loop. Prefer analyze_signal_async, which uses the SDK's native
+        async transport; this is the fallback when only the sync path works.
+        
+        Args:
+            Same as analyze_signal
+            
+        Returns:
+            Dictionary with analysis results, or None on failure
+        """
+        return await asyncio.to_thread(
+            self.analyze_signal,
+            ticker, market_data, news, technicals, macro_context, user_post_text
+        )
+    
     def _parse_llm_response(self, raw_text: str, ticker: str) -> Optional[Dict[str, Any]]:
         """
-        Parse LLM response with multiple fallback strategies.
+        Parse LLM response: single-pass object extraction, then JSON repair.
         
         Args:
             raw_text: Raw text response from LLM
@@ -460,47 +1320,30 @@ class AIService:
             Parsed dictionary or None if all strategies fail
         """
         if not raw_text or not raw_text.strip():
-            logger.error(f"Empty response from LLM for {ticker}")
+            logger.error("Empty response from LLM for %s", ticker)
             return None
         
-        # Strategy 1: Direct JSON parse
-        try:
-            return json.loads(raw_text)
-        except json.JSONDecodeError:
-            pass
+        # Strategy 1: Strip markdown fences, locate the outermost object in one
+        # scan (skips prose and string literals), then parse it once
+        text = raw_text.strip().removeprefix('```json').removeprefix('```').removesuffix('```')
+        json_str = _extract_json_object(text)
+        if json_str is not None:
+            try:
+                return _json_loads(json_str)
+            except json.JSONDecodeError:
+                pass
         
-        # Strategy 2: Extract JSON from markdown code blocks
-        try:
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_text, re.DOTALL | re.IGNORECASE)
-            if json_match:
-                return json.loads(json_match.group(1))
-        except (json.JSONDecodeError, AttributeError):
-            pass
+        # Strategy 2: Repair truncated/malformed JSON (missing braces, trailing commas)
+        if HAS_JSON_REPAIR:
+            try:
+                repaired = _json_loads(repair_json(raw_text))
+                if isinstance(repaired, dict) and repaired:
+                    logger.warning("Repaired malformed JSON response for %s", ticker)
+                    return repaired
+            except (json.JSONDecodeError, ValueError, TypeError):
+                pass
         
-        # Strategy 3: Find JSON object in text (look for { ... })
-        try:
-            # Find the first { and last } that might contain JSON
-            start_idx = raw_text.find('{')
-            end_idx = raw_text.rfind('}')
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                json_str = raw_text[start_idx:end_idx + 1]
-                return json.loads(json_str)
-        except json.JSONDecodeError:
-            pass
-        
-        # Strategy 4: Try to fix common JSON issues
-        try:
-            # Remove trailing commas, fix quotes, etc.
-            cleaned = raw_text.strip()
-            # Remove markdown formatting
-            cleaned = re.sub(r'```json\s*', '', cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(r'```\s*', '', cleaned)
-            # Try parsing again
-            return json.loads(cleaned)
-        except json.JSONDecodeError:
-            pass
-        
-        logger.error(f"Failed to parse LLM response for {ticker}. Raw text (first 500 chars): {raw_text[:500]}")
+        logger.error("Failed to parse LLM response for %s. Raw text (first 500 chars): %s", ticker, raw_text[:500])
         return None
     
     def _validate_analysis_result(self, parsed_result: Dict[str, Any], ticker: str) -> Optional[Dict[str, Any]]:
@@ -517,56 +1360,223 @@ class AIService:
         try:
             # Validate with Pydantic
             validated = AIAnalysisResult(**parsed_result)
-            return validated.dict()
+            return validated.model_dump()
         except ValidationError as e:
-            logger.warning(f"Validation error for {ticker}: {e.errors()}")
+            logger.warning("Validation error for %s: %s", ticker, e.errors())
             
-            # Fallback: Try to construct valid result from partial data
+            # Fallback: sanitize each field explicitly, then build the model
+            # without running the validators a second time
             try:
-                sentiment_score = int(parsed_result.get('sentiment_score', 50))
-                calculated_risk = self._calculate_risk_from_score(sentiment_score)
-                
-                fallback_result = {
-                    'user_thesis': parsed_result.get('user_thesis', 'Neutral'),
-                    'summary': parsed_result.get('summary', 'Analysis unavailable'),
-                    'sentiment_score': sentiment_score,
-                    'risk_level': calculated_risk,  # Use calculated risk based on score
-                    'tags': parsed_result.get('tags', [])
-                }
-                
-                # Validate fallback
-                validated_fallback = AIAnalysisResult(**fallback_result)
-                logger.info(f"Used fallback validation for {ticker} (score={sentiment_score}, risk={calculated_risk})")
-                return validated_fallback.dict()
-            except (ValidationError, ValueError, TypeError) as fallback_error:
-                logger.error(f"Fallback validation also failed for {ticker}: {fallback_error}")
+                sentiment_score = max(0, min(100, round(float(parsed_result.get('sentiment_score', DEFAULT_SENTIMENT_SCORE)))))
+            except (ValueError, TypeError, OverflowError) as fallback_error:
+                logger.error("Fallback validation also failed for %s: %s", ticker, fallback_error)
                 return None
+            calculated_risk = self._calculate_risk_from_score(sentiment_score)
+            
+            user_thesis = str(parsed_result.get('user_thesis', DEFAULT_USER_THESIS)).strip().capitalize()
+            if user_thesis not in VALID_USER_THESIS:
+                user_thesis = DEFAULT_USER_THESIS
+            
+            tags = parsed_result.get('tags', [])
+            if isinstance(tags, str):
+                tags = [tag.strip() for tag in tags.split(',')]
+            elif not isinstance(tags, list):
+                tags = []
+            
+            fallback_result = {
+                'user_thesis': user_thesis,
+                'summary': str(parsed_result.get('summary') or 'Analysis unavailable'),
+                'sentiment_score': sentiment_score,
+                'risk_level': calculated_risk,  # Use calculated risk based on score
+                'tags': [str(tag) for tag in tags if tag]
+            }
+            
+            logger.info("Used fallback validation for %s (score=%s, risk=%s)", ticker, sentiment_score, calculated_risk)
+            return AIAnalysisResult.model_construct(**fallback_result).model_dump()
 
-    def analyze_with_gemini(self, prompt: str) -> Optional[str]:
+    def analyze_signals_batch(self, items: List[SignalInput]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze several tickers with one Gemini call per chunk.
+        
+        The static instructions are shared by every query in the chunk, so the
+        fixed prompt cost and the network round-trip are paid once per
+        AI_BATCH_SIZE tickers instead of once per ticker. If the model returns
+        the wrong number of results, the chunk falls back to per-item calls.
+        
+        Args:
+            items: Inputs to analyze, in order
+            
+        Returns:
+            Analysis results aligned with items (None where analysis failed)
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        pending = []
+        numbers = _format_numeric_fields([item.market_data for item in items])
+        
+        # Serve what we can from the no-data guard and result cache first
+        for idx, item in enumerate(items):
+            no_data_result = self._insufficient_data_result(
+                item.ticker, item.market_data, item.news, item.technicals
+            )
+            if no_data_result is not None:
+                results[idx] = no_data_result
+                continue
+            
+            prompt = self._build_signal_prompt(*item, numbers=numbers[idx])
+            if prompt is None:
+                continue  # oversized prompt: leave the result as None
+            
+            cache_key = self._signal_cache_key(prompt)
+            cached_result = self.cache.get(cache_key)
+            if cached_result is not None:
+                logger.info("Cache hit for %s analysis", item.ticker)
+                results[idx] = cached_result
+            else:
+                pending.append((idx, item, cache_key))
+        
+        for start in range(0, len(pending), AI_BATCH_SIZE):
+            chunk = pending[start:start + AI_BATCH_SIZE]
+            batch_results = self._analyze_chunk([item for _, item, _ in chunk])
+            
+            if batch_results is None:
+                logger.warning("Batch of %s tickers failed, falling back to per-ticker calls", len(chunk))
+                for idx, item, _ in chunk:
+                    results[idx] = self.analyze_signal(*item)
+                continue
+            
+            for (idx, item, cache_key), validated_result in zip(chunk, batch_results):
+                if validated_result:
+                    self.cache.set(cache_key, validated_result)
+                    results[idx] = validated_result
+                else:
+                    results[idx] = self.analyze_signal(*item)
+        
+        return results
+    
+    def _analyze_chunk(self, chunk: List[SignalInput]) -> Optional[List[Optional[Dict[str, Any]]]]:
+        """
+        Send one multi-query prompt and map the results back to the inputs.
+        
+        Args:
+            chunk: Up to AI_BATCH_SIZE inputs
+            
+        Returns:
+            Validated results aligned with chunk, or None if the response
+            could not be matched to the queries
+        """
+        queries = []
+        numbers = _format_numeric_fields([item.market_data for item in chunk])
+        for i, item in enumerate(chunk, start=1):
+            ctx = self._build_prompt_context(*item, numbers=numbers[i - 1])
+            queries.append(
+                f"# Query {i}: {item.ticker}\n{ctx['evidence']}\n"
+                f"User thesis: \"{ctx['user_thesis_text']}\""
+            )
+        
+        prompt = _BATCH_PROMPT_HEADER % len(chunk) + "\n\n".join(queries)
+        tickers = ", ".join(item.ticker for item in chunk)
+        
+        # Transient API errors are retried with backoff inside the helper
+        raw_text = self._generate_with_backoff(prompt, tickers, _BATCH_GENERATION_CONFIG)
+        if raw_text is None:
+            return None
+        
+        parsed = self._parse_llm_response(raw_text, tickers)
+        entries = parsed.get('results') if isinstance(parsed, dict) else None
+        if not isinstance(entries, list) or len(entries) != len(chunk):
+            logger.warning("Batch response for [%s] did not match query count", tickers)
+            return None
+        
+        # Fast path: the whole batch validates against the schema in one go
+        try:
+            validated_batch = BatchAIAnalysisResult(results=entries).results
+        except ValidationError:
+            validated_batch = None
+        if validated_batch is not None:
+            by_id = {result.id.upper(): result for result in validated_batch}
+            batch_results = []
+            for item, result in zip(chunk, validated_batch):
+                result = by_id.get(item.ticker.upper(), result).model_dump(exclude={'id'})
+                result['risk_level'] = self._calculate_risk_from_score(result['sentiment_score'])
+                batch_results.append(result)
+            return batch_results
+        
+        # Prefer matching on the echoed id; fall back to position
+        by_id = {
+            str(entry.get('id', '')).upper(): entry
+            for entry in entries if isinstance(entry, dict)
+        }
+        batch_results = []
+        for item, entry in zip(chunk, entries):
+            entry = by_id.get(item.ticker.upper(), entry)
+            if isinstance(entry, dict):
+                batch_results.append(self._finalize_result(dict(entry), item.ticker))
+            else:
+                batch_results.append(None)
+        return batch_results
+    
+    def analyze_with_gemini(self, prompt: str, *, temperature: Optional[float] = None) -> Optional[str]:
         """Generic prompt-based analysis used by batch insight population.
 
         Args:
             prompt: The full instruction string expecting JSON output.
+            temperature: Optional sampling temperature (e.g. 0 for deterministic re-scoring).
         Returns:
             Raw text response from Gemini (expected to be JSON) or None on failure.
         """
+        model = self.model
+        if temperature is not None:
+            cfg = dict(_JSON_CONFIG_KEY, temperature=temperature)
+            model = _get_model(GEMINI_MODEL_NAME, tuple(sorted(cfg.items())))
+        
+        cache_key = make_cache_key({'prompt': prompt, 'temperature': temperature})
+        cached_text = self.cache.get(cache_key)
+        if cached_text is not None:
+            logger.info("Batch prompt served from cache")
+            return cached_text
+        
         try:
-            # Use ThreadPoolExecutor to add timeout to the API call
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(self.model.generate_content, prompt)
-                try:
-                    response = future.result(timeout=AI_API_TIMEOUT)
-                    logger.info("Batch prompt analyzed successfully")
-                    return response.text
-                except FutureTimeoutError:
-                    logger.error(f"Batch analysis timeout after {AI_API_TIMEOUT}s")
-                    return None
+            # The deadline is enforced by the transport, which aborts the request
+            response = model.generate_content(prompt, request_options={"timeout": AI_API_TIMEOUT})
+            logger.info("Batch prompt analyzed successfully")
+            text = response.text
+            # Only cache parseable output so a truncated reply can be retried
+            if _is_complete_json(text):
+                self.cache.set(cache_key, text)
+            else:
+                logger.warning("Not caching unparseable batch response")
+            return text
+        except google_exceptions.DeadlineExceeded:
+            logger.error("Batch analysis timeout after %ss", AI_API_TIMEOUT)
+            return None
         except Exception as e:
             error_msg = sanitize_log_message(str(e))
-            logger.error(f"Batch analysis failed: {error_msg}")
+            logger.error("Batch analysis failed: %s", error_msg)
             return None
 
 
+_service_singleton: Optional[AIService] = None
+_service_lock = threading.Lock()
+
+
+def get_ai_service() -> AIService:
+    """
+    Return the process-wide AIService, creating it on first use.
+    
+    A failed initialization is not cached, so callers can retry later
+    (e.g. once GOOGLE_API_KEY becomes available).
+    
+    Returns:
+        Shared AIService instance
+    """
+    global _service_singleton
+    if _service_singleton is None:
+        with _service_lock:
+            if _service_singleton is None:
+                _service_singleton = AIService()
+    return _service_singleton
+
+
 def main():
     """Test the AI service."""
     logging.basicConfig(
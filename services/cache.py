@@ -0,0 +1,252 @@
+"""Caches for expensive, repeatable results (e.g. AI analyses)."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(payload: Any) -> str:
+    """
+    Build a stable cache key from an arbitrary JSON-like payload.
+
+    Args:
+        payload: Value to hash (dicts are canonicalized with sorted keys)
+
+    Returns:
+        Hex MD5 digest of the canonical JSON representation
+    """
+    canonical = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.md5(canonical.encode('utf-8')).hexdigest()
+
+
+class FileCache:
+    """
+    Stores JSON-serializable values as one file per key with a TTL.
+
+    Expired entries are deleted when read, and swept from the whole
+    directory every sweep_interval writes so keys that are never read
+    again do not accumulate on disk.
+    """
+
+    def __init__(self, directory: str, default_ttl: int = 900, sweep_interval: int = 256):
+        """
+        Initialize the cache directory.
+
+        Args:
+            directory: Directory where cache entries are written
+            default_ttl: Default time-to-live for entries, in seconds
+            sweep_interval: Writes between sweeps of expired entries
+        """
+        self.directory = directory
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Read a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing, expired, or unreadable
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Cache read failed for {key}: {e}")
+            return None
+
+        # Anything other than an entry written by set() is discarded like an expired one
+        malformed = not (
+            isinstance(entry, dict) and 'value' in entry
+            and isinstance(entry.get('ts'), (int, float))
+            and isinstance(entry.get('ttl', self.default_ttl), (int, float))
+        )
+        if malformed:
+            logger.debug(f"Discarding malformed cache entry for {key}")
+
+        if malformed or time.time() - entry['ts'] > entry.get('ttl', self.default_ttl):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        return entry.get('value')
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Write a value to the cache.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Time-to-live in seconds (defaults to default_ttl)
+        """
+        entry = {
+            'ts': time.time(),
+            'ttl': ttl if ttl is not None else self.default_ttl,
+            'value': value
+        }
+        tmp_path = None
+        try:
+            # Write to a temp file and rename so readers never see partial JSON
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.sweep_interval == 0
+        if due:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """
+        Delete expired or malformed entries and abandoned temp files.
+
+        Only files last modified more than default_ttl ago are opened, so a
+        sweep reads just the entries that can have expired.
+
+        Returns:
+            Number of files removed
+        """
+        cutoff = time.time() - self.default_ttl
+        removed = 0
+        try:
+            with os.scandir(self.directory) as entries:
+                candidates = [
+                    entry for entry in entries
+                    if entry.is_file() and entry.stat().st_mtime < cutoff
+                ]
+        except OSError as e:
+            logger.warning(f"Cache sweep failed for {self.directory}: {e}")
+            return 0
+
+        for entry in candidates:
+            if entry.name.endswith('.json'):
+                # get() deletes the file when the entry is expired or malformed
+                if self.get(entry.name[:-len('.json')]) is None and not os.path.exists(entry.path):
+                    removed += 1
+            elif entry.name.endswith('.tmp'):
+                # Left behind by a writer that died between mkstemp and os.replace
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+
+        if removed:
+            logger.debug(f"Cache sweep removed {removed} files from {self.directory}")
+        return removed
+
+
+class TTLCache:
+    """Thread-safe in-memory LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, maxsize: int = 512, ttl: int = 60):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries; least recently used are evicted first
+            ttl: Time-to-live for entries, in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Read a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds (defaults to the cache TTL)
+        """
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class TieredCache:
+    """Memory cache in front of a file cache: memory -> disk -> caller."""
+
+    def __init__(self, memory: TTLCache, disk: FileCache):
+        """
+        Initialize the tiers.
+
+        Args:
+            memory: Fast process-local cache for hot keys
+            disk: Persistent cache shared across restarts
+        """
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[Any]:
+        """Read from memory, falling back to disk and backfilling memory on a disk hit."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Write to both tiers."""
+        self.memory.set(key, value)
+        self.disk.set(key, value, ttl)
@@ -1,59 +1,396 @@
 """Database service for managing Supabase operations."""
 import os
+import gzip
+import argparse
+import json
+import time
+import queue
+import random
+import atexit
 import logging
-from typing import Dict, Any, Optional
-from supabase import create_client, Client
+import functools
+import threading
+from urllib.parse import urlparse
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+import httpx
+from postgrest.exceptions import APIError
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
 
-load_dotenv()
+from services.cache import TTLCache
+
+from core.config import (
+    DB_BOT_USER_VERIFY_TTL,
+    DB_BULK_INSERT_CHUNK,
+    DB_CLIENT_TIMEOUT,
+    DB_DEAD_LETTER_PATH,
+    DB_GZIP_MIN_BYTES,
+    DB_GZIP_REQUESTS,
+    DB_KEEPALIVE_EXPIRY,
+    DB_MAX_KEEPALIVE_CONNECTIONS,
+    DB_RECENT_SIGNALS_SIZE,
+    DB_RETRY_BACKOFF_MAX,
+    DB_WRITE_BATCH_SIZE,
+    DB_WRITE_BATCH_WAIT,
+    DB_WRITE_QUEUE_SIZE,
+    MAX_RETRIES,
+    RETRY_BACKOFF_MS,
+)
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    # httpx only speaks HTTP/2 when the h2 package is installed
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
 
 logger = logging.getLogger(__name__)
 
+# Bot user IDs that passed verification, shared by every DatabaseService in
+# the process and re-checked after DB_BOT_USER_VERIFY_TTL
+_verified_bot_users = TTLCache(maxsize=32, ttl=DB_BOT_USER_VERIFY_TTL)
+
+# (ticker, minute) keys of signals already saved by this process. A bounded
+# TTL cache gives exact membership without a bloom filter dependency.
+_recent_signals = TTLCache(maxsize=DB_RECENT_SIGNALS_SIZE, ttl=120)
+
+# Cleared when the create_signal RPC (database_migrations/create_signal_function.sql)
+# is not installed, so save_signal stops trying it
+_create_signal_rpc_available = True
+
+# Failures a Supabase request can raise: PostgREST error responses and transport errors
+_DB_ERRORS = (APIError, httpx.HTTPError)
+
+T = TypeVar("T")
+
+
+def _is_transient_db_error(error: Exception) -> bool:
+    """
+    Check whether a failed write is safe to retry.
+    
+    The wrapped calls are non-idempotent inserts, so only failures where the
+    request never reached the database qualify: connection errors, connect or
+    pool timeouts, and PostgREST's connection-level codes (PGRST000-PGRST003:
+    database unreachable or pool timeout). Read timeouts and 5xx responses
+    may follow a committed write, and retrying them could duplicate rows.
+    """
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    if isinstance(error, APIError):
+        return str(error.code or "").startswith("PGRST00")
+    return False
+
+
+def _retry_db_call(description: str, call: Callable[[], T]) -> T:
+    """
+    Run a Supabase write, retrying failures that never reached the database.
+    
+    Waits a random 0..min(RETRY_BACKOFF_MS * 2^(attempt-1), DB_RETRY_BACKOFF_MAX)
+    between attempts, up to MAX_RETRIES attempts in total.
+    
+    Args:
+        description: What the call does, for logging
+        call: Zero-argument function issuing the request
+        
+    Returns:
+        The call's result
+        
+    Raises:
+        APIError, httpx.HTTPError: On a permanent error or the final attempt
+    """
+    for attempt in range(1, MAX_RETRIES):
+        try:
+            return call()
+        except _DB_ERRORS as e:
+            if not _is_transient_db_error(e):
+                raise
+            delay = random.uniform(0, min(RETRY_BACKOFF_MS / 1000 * 2 ** (attempt - 1), DB_RETRY_BACKOFF_MAX))
+            logger.warning(
+                "Transient database error on %s (attempt %s/%s), retrying in %.2fs: %s",
+                description, attempt, MAX_RETRIES, delay, e
+            )
+            time.sleep(delay)
+    return call()
+
+
+def _signal_key(ticker: str) -> str:
+    """Deduplication key for a signal: (ticker, current minute)."""
+    return f"{ticker}:{int(time.time() // 60)}"
+
+
+def _is_duplicate_signal(ticker: str) -> bool:
+    """
+    Check whether a signal for ticker was already saved this minute.
+    
+    Returns:
+        True if this (ticker, minute) was saved before and should be skipped
+    """
+    return bool(_recent_signals.get(_signal_key(ticker)))
+
+
+def _mark_signal_saved(ticker: str) -> None:
+    """
+    Record a successful write so repeats this minute are skipped.
+    
+    Only called after the write succeeds, so a failed or dead-lettered
+    save can still be retried within the same window.
+    """
+    _recent_signals.set(_signal_key(ticker), True)
+
+
+def _dead_letter(table: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    Append rows that could not be written to the dead-letter file for replay.
+    
+    One JSON object per line: {"table": ..., "row": ...}.
+    """
+    try:
+        directory = os.path.dirname(DB_DEAD_LETTER_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(DB_DEAD_LETTER_PATH, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(_dumps_compact({"table": table, "row": row}) + "\n")
+        logger.warning("Wrote %s failed %s rows to %s", len(rows), table, DB_DEAD_LETTER_PATH)
+    except OSError as e:
+        logger.error("Could not write %s failed %s rows to dead-letter file: %s", len(rows), table, e)
+
+
+class DBConfig(NamedTuple):
+    """Supabase connection settings, read from the environment once."""
+    url: Optional[str]
+    key: Optional[str]
+    bot_user_id: Optional[str]
+
+
+@functools.lru_cache(maxsize=1)
+def _load_db_config() -> DBConfig:
+    """
+    Read database settings once per process.
+    
+    .env is only parsed when the credentials are not already in the
+    environment (e.g. set by the deployment), and never at import time.
+    """
+    if not (os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")):
+        load_dotenv()
+    return DBConfig(
+        url=os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL"),
+        key=os.environ.get("SUPABASE_KEY") or os.environ.get("SUPABASE_SERVICE_ROLE_KEY"),
+        bot_user_id=os.environ.get("BOT_USER_ID") or None,
+    )
+
+
+def _dumps_compact(value: Any) -> str:
+    """Serialize to compact JSON (no whitespace); non-JSON values fall back to str()."""
+    if HAS_ORJSON:
+        return orjson.dumps(value, default=str).decode()
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _check_supabase_url(url: str) -> None:
+    """
+    Warn about SUPABASE_URL values that point at a Postgres pooler.
+    
+    supabase-py talks to the PostgREST HTTP API (https://<project>.supabase.co),
+    whose own connection pool keeps prepared statements. A postgres:// DSN or
+    the Supavisor transaction-mode port (6543) means the URL was copied from
+    the wrong settings page.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ("postgres", "postgresql"):
+        logger.warning(
+            "SUPABASE_URL is a Postgres connection string; use the project's https API URL instead"
+        )
+    elif parsed.port == 6543:
+        logger.warning(
+            "SUPABASE_URL points at the Supavisor transaction pooler (port 6543), "
+            "which disables prepared statements; use the project's https API URL"
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client(url: str, key: str) -> Client:
+    """
+    Return the process-wide Supabase client for a URL/key pair.
+    
+    Every DatabaseService shares one client, and with it one keep-alive
+    HTTP session, instead of building a new one per instance. The PostgREST
+    session is swapped for a pooled httpx client (HTTP/2 when h2 is
+    installed) so bursts of requests reuse warm connections.
+    """
+    client = create_client(
+        url, key, options=ClientOptions(postgrest_client_timeout=DB_CLIENT_TIMEOUT, schema="public")
+    )
+    
+    session = client.postgrest.session
+    client.postgrest.session = httpx.Client(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        http2=HAS_HTTP2,
+        limits=httpx.Limits(
+            max_keepalive_connections=DB_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=DB_KEEPALIVE_EXPIRY,
+        ),
+    )
+    session.close()
+    return client
+
 
 class DatabaseService:
     """Handles all database interactions with Supabase."""
     
     def __init__(self):
-        url = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
-        key = os.environ.get("SUPABASE_KEY") or os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+        config = _load_db_config()
+        url, key = config.url, config.key
         
         if not url or not key:
             raise ValueError("Missing Supabase credentials in .env file")
+        _check_supabase_url(url)
             
-        self.supabase: Client = create_client(url, key)
+        self.supabase: Client = _get_client(url, key)
+        
+        # Request builders are stateless between calls (each insert/select
+        # returns a fresh query), so bind the hot tables once
+        self._posts = self.supabase.table("posts")
+        self._profiles = self.supabase.table("profiles")
+        
+        # Background signal writer, started on first enqueue_signal
+        self._write_queue: "queue.Queue[Tuple[str, Dict[str, Any], Dict[str, Any]]]" = queue.Queue(
+            maxsize=DB_WRITE_QUEUE_SIZE
+        )
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
         logger.info("Database service initialized successfully")
         
-        # Verify bot user on startup if configured
-        bot_user_id = os.environ.get("BOT_USER_ID")
-        if bot_user_id:
-            self._verify_bot_user(bot_user_id)
+        # Resolve the bot user once; verified IDs are cached so saves don't
+        # repeat the profiles lookup. Without BOT_USER_ID saves fail fast.
+        self._bot_user_id = config.bot_user_id
+        if self._bot_user_id:
+            self._verify_bot_user(self._bot_user_id)
+        else:
+            logger.warning("BOT_USER_ID is not set; saving bot signals is disabled")
     
     def _verify_bot_user(self, user_id: str) -> bool:
         """
         Verify that the bot user exists and has proper permissions.
         
+        Successful checks are cached for DB_BOT_USER_VERIFY_TTL seconds, so
+        repeat calls skip the network; failures are never cached.
+        
         Args:
             user_id: User ID to verify
             
         Returns:
             True if user exists and is valid, False otherwise
         """
+        if _verified_bot_users.get(user_id):
+            return True
+        
         try:
-            response = self.supabase.table("profiles").select("id").eq("id", user_id).single().execute()
-            if response.data:
-                logger.info(f"Bot user verified: {user_id}")
+            # HEAD request with an exact count: existence check with no response body
+            response = (
+                self._profiles
+                .select("id", head=True, count="exact")
+                .eq("id", user_id)
+                .execute()
+            )
+            if response.count:
+                logger.info("Bot user verified: %s", user_id)
+                _verified_bot_users.set(user_id, True)
                 return True
             else:
-                logger.warning(f"Bot user not found: {user_id}")
+                logger.warning("Bot user not found: %s", user_id)
                 return False
-        except Exception as e:
-            logger.error(f"Error verifying bot user {user_id}: {str(e)}")
+        except _DB_ERRORS as e:
+            logger.error("Error verifying bot user %s: %s", user_id, e)
             return False
 
+    @staticmethod
+    def build_signal_row(ticker: str, insight: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+        """
+        Build the posts row for one AI analysis.
+        
+        Args:
+            ticker: Stock ticker symbol
+            insight: Dictionary containing AI analysis results
+            user_id: Author of the post (the bot user)
+            
+        Returns:
+            Row dict ready for insert
+        """
+        tags = insight['tags']
+        return {
+            "user_id": user_id,
+            "ticker": ticker,
+            "content": f"{insight['summary']}\n\n{'#' + ' #'.join(tags) if tags else ''}",
+            "ai_score": insight['sentiment_score'],
+            "ai_risk": insight['risk_level'],
+            "ai_summary": _dumps_compact(insight),
+        }
+
+    def _insert_rows(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert rows without reading them back.
+        
+        With orjson available the payload is serialized once by orjson and
+        posted through the PostgREST client's own session (same base URL and
+        auth headers), bypassing the query builder's stdlib json encoding.
+        Large payloads are gzipped when DB_GZIP_REQUESTS is enabled.
+        
+        Args:
+            table: Table name
+            rows: Row dicts to insert
+            
+        Raises:
+            APIError: If PostgREST rejects the insert
+            httpx.HTTPError: If the request fails
+        """
+        if not HAS_ORJSON:
+            self.supabase.table(table).insert(rows, returning="minimal").execute()
+            return
+        
+        payload = orjson.dumps(rows)
+        headers = {"Content-Type": "application/json", "Prefer": "return=minimal"}
+        if DB_GZIP_REQUESTS and len(payload) >= DB_GZIP_MIN_BYTES:
+            # Text-heavy ai_summary rows compress several-fold
+            payload = gzip.compress(payload, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        
+        response = self.supabase.postgrest.session.post(f"/{table}", content=payload, headers=headers)
+        response.raise_for_status()
+
+    def _get_verified_bot_user(self) -> Optional[str]:
+        """
+        Return the bot user ID, verifying it against profiles when not cached.
+        
+        Returns:
+            Bot user ID, or None if it is not configured or does not exist
+        """
+        BOT_USER_ID = self._bot_user_id
+        if BOT_USER_ID is None:
+            logger.error("BOT_USER_ID is not set. Set the BOT_USER_ID environment variable.")
+            return None
+        
+        # Verify bot user exists and has proper permissions (cached after success)
+        if not self._verify_bot_user(BOT_USER_ID):
+            logger.error("BOT_USER_ID %s not found or invalid. Check BOT_USER_ID environment variable.", BOT_USER_ID)
+            return None
+        return BOT_USER_ID
+
     def save_signal(self, ticker: str, insight: Dict[str, Any], market_data: Dict[str, Any]) -> Optional[Any]:
         """
         Save AI analysis to the posts table.
         
+        Transient failures are retried with backoff; a write that still fails
+        is appended to the dead-letter file (DB_DEAD_LETTER_PATH) for replay.
+        
         Args:
             ticker: Stock ticker symbol
             insight: Dictionary containing AI analysis results
@@ -62,43 +399,201 @@ class DatabaseService:
         Returns:
             Supabase response or None if failed
         """
-        # Get BOT_USER_ID from environment variable with fallback
-        BOT_USER_ID = os.environ.get("BOT_USER_ID", "2de4618e-25af-4ebc-a572-f92b7954fb0e")
+        global _create_signal_rpc_available
         
-        # Verify bot user exists and has proper permissions
-        if not self._verify_bot_user(BOT_USER_ID):
-            logger.error(f"BOT_USER_ID {BOT_USER_ID} not found or invalid. Check BOT_USER_ID environment variable.")
+        if self._bot_user_id is None:
+            logger.error("BOT_USER_ID is not set, cannot save analysis for %s", ticker)
             return None
         
-        content_body = f"{insight['summary']}\n\n"
-        content_body += " ".join([f"#{tag}" for tag in insight['tags']])
-
-        data = {
-            "user_id": BOT_USER_ID,
-            "ticker": ticker,
-            "content": content_body,
-            "ai_score": insight['sentiment_score'],
-            "ai_risk": insight['risk_level'],
-            "ai_summary": str(insight),
-        }
+        if _is_duplicate_signal(ticker):
+            logger.info("Skipping duplicate analysis for %s (already saved this minute)", ticker)
+            return None
+        
+        if _create_signal_rpc_available:
+            # Bot user check and insert happen server-side in one round-trip
+            data = self.build_signal_row(ticker, insight, self._bot_user_id)
+            # create_signal takes each column as p_<column>
+            params = {f"p_{k}": v for k, v in data.items()}
+            try:
+                response = _retry_db_call(
+                    f"create_signal for {ticker}",
+                    lambda: self.supabase.rpc("create_signal", params).execute()
+                )
+                _verified_bot_users.set(self._bot_user_id, True)
+                _mark_signal_saved(ticker)
+                logger.info("Successfully posted analysis for %s", ticker)
+                return response
+            except APIError as e:
+                if e.code != "PGRST202":
+                    logger.error("Failed to save analysis for %s: %s", ticker, e)
+                    _dead_letter("posts", [data])
+                    return None
+                logger.warning("create_signal RPC not installed, falling back to check + insert")
+                _create_signal_rpc_available = False
+            except httpx.HTTPError as e:
+                logger.error("Failed to save analysis for %s: %s", ticker, e)
+                _dead_letter("posts", [data])
+                return None
+        
+        BOT_USER_ID = self._get_verified_bot_user()
+        if BOT_USER_ID is None:
+            return None
+        
+        data = self.build_signal_row(ticker, insight, BOT_USER_ID)
         
         try:
-            response = self.supabase.table("posts").insert(data).execute()
-            logger.info(f"Successfully posted analysis for {ticker}")
+            response = _retry_db_call(f"insert for {ticker}", lambda: self._posts.insert(data).execute())
+            _mark_signal_saved(ticker)
+            logger.info("Successfully posted analysis for %s", ticker)
             return response
-        except Exception as e:
-            logger.error(f"Failed to save analysis for {ticker}: {str(e)}")
+        except _DB_ERRORS as e:
+            logger.error("Failed to save analysis for %s: %s", ticker, e)
+            _dead_letter("posts", [data])
             return None
 
+    def save_signals(self, items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> int:
+        """
+        Save many AI analyses to the posts table in bulk.
+        
+        Batch counterpart of save_signal: the bot user is checked once and
+        all rows go out in multi-row inserts instead of one request each.
+        
+        Args:
+            items: (ticker, insight, market_data) tuples, as passed to save_signal
+            
+        Returns:
+            Number of rows inserted successfully
+        """
+        if not items:
+            return 0
+        
+        BOT_USER_ID = self._get_verified_bot_user()
+        if BOT_USER_ID is None:
+            return 0
+        
+        # Skip tickers saved this minute, and repeats within the batch itself
+        rows = []
+        batch_tickers = set()
+        for ticker, insight, _ in items:
+            if ticker in batch_tickers or _is_duplicate_signal(ticker):
+                continue
+            batch_tickers.add(ticker)
+            rows.append(self.build_signal_row(ticker, insight, BOT_USER_ID))
+        return self.save_signals_bulk(rows)
+
+    def enqueue_signal(self, ticker: str, insight: Dict[str, Any], market_data: Dict[str, Any]) -> bool:
+        """
+        Queue a signal for a background bulk insert and return immediately.
+        
+        A single writer thread drains the queue in batches of up to
+        DB_WRITE_BATCH_SIZE through save_signals. The queue is bounded, so a
+        stalled database cannot grow memory without limit.
+        
+        Args:
+            ticker: Stock ticker symbol
+            insight: Dictionary containing AI analysis results
+            market_data: Dictionary containing market data
+            
+        Returns:
+            True if queued, False if the queue is full (signal dropped)
+        """
+        self._start_writer()
+        try:
+            self._write_queue.put_nowait((ticker, insight, market_data))
+            return True
+        except queue.Full:
+            logger.warning("Signal write queue full, dropping analysis for %s", ticker)
+            return False
+
+    def flush(self) -> None:
+        """Block until every queued signal has been written (or failed)."""
+        if self._writer is not None:
+            self._write_queue.join()
+
+    def _start_writer(self) -> None:
+        """Start the background writer thread once."""
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain, name="signal-writer", daemon=True)
+                self._writer.start()
+                # Daemon thread: write out what is queued before the process exits
+                atexit.register(self.flush)
+
+    def _drain(self) -> None:
+        """Writer loop: collect a batch (bounded by size and wait time), then bulk insert it."""
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + DB_WRITE_BATCH_WAIT
+            while len(batch) < DB_WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self.save_signals(batch)
+            except Exception as e:
+                # Keep the writer alive; the batch is lost but later ones still go out
+                logger.error("Background write of %s signals failed: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    def save_signals_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert many prebuilt posts rows with one request per chunk.
+        
+        PostgREST accepts an array payload and performs a single multi-row
+        insert, so N signals cost ceil(N / DB_BULK_INSERT_CHUNK) round-trips.
+        
+        Args:
+            rows: Row dicts from build_signal_row
+            
+        Returns:
+            Number of rows inserted successfully
+        """
+        inserted = 0
+        for start in range(0, len(rows), DB_BULK_INSERT_CHUNK):
+            chunk = rows[start:start + DB_BULK_INSERT_CHUNK]
+            try:
+                _retry_db_call(
+                    f"bulk insert of {len(chunk)} signals", lambda: self._insert_rows("posts", chunk)
+                )
+                inserted += len(chunk)
+                for row in chunk:
+                    _mark_signal_saved(row["ticker"])
+                logger.info("Bulk inserted %s signals (batch %s)", len(chunk), start // DB_BULK_INSERT_CHUNK + 1)
+            except _DB_ERRORS as e:
+                logger.error("Failed to bulk insert %s signals: %s", len(chunk), e)
+                _dead_letter("posts", chunk)
+        return inserted
+
 
 def main():
-    """Test the database connection."""
+    """Test the database connection; --selftest also writes a TEST post."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--selftest",
+        action="store_true",
+        help="insert a TEST row into posts (tagged #Test) to check the write path"
+    )
+    args = parser.parse_args()
+    
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
     db = DatabaseService()
+    if not args.selftest:
+        logger.info("Connection OK; pass --selftest to also insert a TEST post")
+        return
+    
     db.save_signal(
         "TEST", 
         {
@@ -10,7 +10,7 @@ Features:
 - Runs 3 times during market hours (10 AM, 12 PM, 2:30 PM ET)
 - Skips when market is closed
 - Batches 5 stocks per AI request to save quota
-- 20-second delay between batches
+- Batch AI requests paced to ANALYST_BATCH_RPM
 - Refreshes ticker list daily at 10 AM
 - Saves to ticker_insights table for global market view
 """
@@ -18,8 +18,8 @@ Features:
 import sys
 import os
 import time
-import re
-import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 import pytz
 
@@ -28,43 +28,27 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import logging
 
+from core.config import (
+    ANALYST_BATCH_RPM,
+    ANALYST_MAX_CONCURRENT_BATCHES,
+    ANALYST_UNCHANGED_CACHE_SIZE,
+    ANALYST_UNCHANGED_PRICE_MOVE,
+    ANALYST_UNCHANGED_TTL,
+    MARKET_DATA_MAX_WORKERS,
+    TICKER_PAGE_SIZE,
+)
+from core.insight_columns import market_insight_columns, safe_float
 from services.market_service import MarketDataService
-from services.ai_service import AIService
+from services.ai_service import SignalInput, compact_news, get_ai_service
 from services.db_service import DatabaseService
+from services.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for independent market-data fetches, reused across batches and tickers
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=MARKET_DATA_MAX_WORKERS, thread_name_prefix='analyst-fetch')
+
 
-def safe_float(value):
-    """
-    Safely convert a value to float.
-    
-    Args:
-        value: Input value to convert (string, number, or None)
-    
-    Returns:
-        float or None: Converted float value, or None if conversion fails
-    
-    Handles:
-        - None values
-        - 'N/A', '-', empty strings
-        - Invalid numeric strings
-        - Already numeric values
-    """
-    if value is None:
-        return None
-    
-    # Handle string cases
-    if isinstance(value, str):
-        value = value.strip()
-        if value in ('N/A', '-', '', 'None'):
-            return None
-    
-    # Try to convert to float
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
 
 
 class GlobalAnalyst:
@@ -76,6 +60,16 @@ class GlobalAnalyst:
     
     # Core list of top stocks to always include (safety net)
     CORE_STOCKS = ['NVDA', 'TSLA', 'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'AMD', 'NFLX', 'SPY']
+    CORE_STOCKS_SET = frozenset(CORE_STOCKS)
+    
+    # Analysis times in Eastern Time (hour, minute), Mon-Fri
+    RUN_TIMES = [(10, 0), (12, 0), (14, 30)]
+    
+    # Signal label for every score 0-100 (<20 Strong Sell, <40 Sell, <60 Hold, <80 Buy)
+    _SIGNAL_LABELS = tuple(
+        'Strong Buy' if s >= 80 else 'Buy' if s >= 60 else 'Hold' if s >= 40 else 'Sell' if s >= 20 else 'Strong Sell'
+        for s in range(101)
+    )
     
     def __init__(self):
         self.data_engine = MarketDataService()
@@ -83,7 +77,7 @@ class GlobalAnalyst:
         
         # Initialize AI service with graceful degradation
         try:
-            self.ai_service = AIService()
+            self.ai_service = get_ai_service()
             self.ai_available = True
             logger.info("Global Analyst: AI service initialized successfully")
         except Exception as e:
@@ -91,13 +85,18 @@ class GlobalAnalyst:
             self.ai_service = None
             self.ai_available = False
         
+        # Last saved analysis per ticker as (price, input signature, analysis)
+        self._recent_analyses = TTLCache(ANALYST_UNCHANGED_CACHE_SIZE, ANALYST_UNCHANGED_TTL)
+        
         # Set up Eastern timezone for market hours
         self.eastern = pytz.timezone('US/Eastern')
+        # (date, open, close) for the current trading day, rebuilt when the date changes
+        self._market_hours = (None, None, None)
         
         # Get user-interest tickers from database
         self.tracked_tickers = self._get_user_interest_tickers()
         
-        core_stocks_count = len([t for t in self.CORE_STOCKS if t in self.tracked_tickers])
+        core_stocks_count = len(self.CORE_STOCKS_SET.intersection(self.tracked_tickers))
         logger.info(
             "Global Analyst initialized",
             extra={
@@ -118,20 +117,26 @@ class GlobalAnalyst:
             List of unique ticker symbols
         """
         try:
-            # Fetch all unique tickers from ticker_insights table
-            response = self.db.supabase.table('ticker_insights').select('ticker').execute()
-            
-            # Extract unique tickers
-            db_tickers = [row['ticker'] for row in response.data if row.get('ticker')]
-            db_tickers = list(set(db_tickers))  # Remove duplicates
-            
-            # Combine with core stocks and remove duplicates
-            all_tickers = list(set(db_tickers + self.CORE_STOCKS))
+            # ticker is the primary key, so rows are already unique; page through them
+            # because PostgREST caps each response at its max-rows setting
+            db_tickers = set()
+            offset = 0
+            while True:
+                response = (
+                    self.db.supabase.table('ticker_insights')
+                    .select('ticker')
+                    .order('ticker')
+                    .range(offset, offset + TICKER_PAGE_SIZE - 1)
+                    .execute()
+                )
+                db_tickers.update(row['ticker'] for row in response.data if row.get('ticker'))
+                if len(response.data) < TICKER_PAGE_SIZE:
+                    break
+                offset += TICKER_PAGE_SIZE
             
-            # Sort for consistency (core stocks first, then alphabetical)
-            core_in_list = [t for t in self.CORE_STOCKS if t in all_tickers]
-            other_tickers = sorted([t for t in all_tickers if t not in self.CORE_STOCKS])
-            sorted_tickers = core_in_list + other_tickers
+            # Sort for consistency (core stocks first, then alphabetical); only the
+            # non-core remainder needs sorting and set difference drops duplicates
+            sorted_tickers = self.CORE_STOCKS + sorted(db_tickers - self.CORE_STOCKS_SET)
             
             logger.info(
                 "Fetched tickers from database",
@@ -164,8 +169,12 @@ class GlobalAnalyst:
             return False
         
         # Check market hours (9:30 AM - 4:00 PM)
-        market_open = now_et.replace(hour=9, minute=30, second=0, microsecond=0)
-        market_close = now_et.replace(hour=16, minute=0, second=0, microsecond=0)
+        today = now_et.date()
+        cached_date, market_open, market_close = self._market_hours
+        if cached_date != today:
+            market_open = self.eastern.localize(datetime(today.year, today.month, today.day, 9, 30))
+            market_close = self.eastern.localize(datetime(today.year, today.month, today.day, 16, 0))
+            self._market_hours = (today, market_open, market_close)
         
         return market_open <= now_et <= market_close
     
@@ -179,36 +188,42 @@ class GlobalAnalyst:
         Returns:
             Signal label: 'Strong Buy', 'Buy', 'Hold', 'Sell', 'Strong Sell'
         """
-        if score >= 80:
-            return 'Strong Buy'
-        elif score >= 60:
-            return 'Buy'
-        elif score >= 40:
-            return 'Hold'
-        elif score >= 20:
-            return 'Sell'
-        else:
-            return 'Strong Sell'
+        return self._SIGNAL_LABELS[max(0, min(100, int(score)))]
     
-    def analyze_batch(self, tickers: list, macro_context=None) -> dict:
+    def _fetch_batch_data(self, tickers: list) -> dict:
+        """
+        Fetch market data for a batch of tickers.
+        
+        Args:
+            tickers: List of stock symbols
+        
+        Returns:
+            Dictionary of {ticker: market_data} for tickers with data
+        """
+        # Prices for the whole batch in one request, then fundamentals per ticker concurrently
+        quotes = self.data_engine.get_quotes(tickers)
+        contexts = _FETCH_EXECUTOR.map(
+            self.data_engine.get_price_context, tickers, [quotes.get(t) for t in tickers]
+        )
+        return {ticker: data for ticker, data in zip(tickers, contexts) if data}
+    
+    def analyze_batch(self, tickers: list, macro_context=None, batch_data: dict = None) -> dict:
         """
         Analyze multiple stocks in a single AI request (batch processing).
         
         Args:
             tickers: List of stock symbols (up to 10)
             macro_context: Pre-fetched VIX and market sentiment
+            batch_data: Market data already fetched by _fetch_batch_data (fetched here if None)
         
         Returns:
-            Dictionary of {ticker: analysis_result}
+            Dictionary of {ticker: analysis_result} for tickers analyzed by the AI
+            (unchanged tickers are re-saved with their previous analysis but not included)
         """
         logger.info(f"Batch analysis started: tickers={tickers}, count={len(tickers)}")
         
-        # Fetch market data for all tickers in batch
-        batch_data = {}
-        for ticker in tickers:
-            market_data = self.data_engine.get_price_context(ticker)
-            if market_data:
-                batch_data[ticker] = market_data
+        if batch_data is None:
+            batch_data = self._fetch_batch_data(tickers)
         
         if not batch_data:
             logger.warning("Batch analysis failed: no market data available", extra={'tickers': tickers})
@@ -219,80 +234,97 @@ class GlobalAnalyst:
             logger.warning("AI service not available. Skipping batch analysis.")
             return {}
         
-        # Create batch prompt
-        prompt = self._create_batch_prompt(batch_data, macro_context)
-        
-        try:
-            # Single AI request for all stocks
-            response = self.ai_service.model.generate_content(prompt)
-            
-            # Parse response
-            results = self._parse_batch_response(response.text, list(batch_data.keys()))
-            
-            # Save to database
-            saved_count = 0
-            for ticker, analysis in results.items():
-                if self._save_ticker_insight(ticker, analysis, batch_data[ticker], macro_context):
-                    saved_count += 1
-            
+        # Re-use today's analysis for tickers whose inputs have barely moved;
+        # only the Gemini call is skipped, their rows still get current market data
+        unchanged = {}
+        pending = {}
+        for ticker, market_data in batch_data.items():
+            previous = self._previous_analysis(ticker, market_data, macro_context)
+            if previous is not None:
+                unchanged[ticker] = previous
+            else:
+                pending[ticker] = market_data
+        if unchanged:
             logger.info(
-                f"Batch analysis complete: saved={saved_count}, total={len(results)}",
-                extra={'saved_count': saved_count, 'total_count': len(results)}
+                f"Skipping AI for unchanged tickers: {list(unchanged)}",
+                extra={'skipped_count': len(unchanged)}
             )
-            return results
-            
-        except Exception as e:
-            error_msg = str(e)
-            if '429' in error_msg or 'quota' in error_msg.lower():
-                logger.warning("Batch analysis rate limited", extra={'tickers': tickers})
-            else:
-                logger.error(f"Batch analysis error: {error_msg[:100]}", extra={'tickers': tickers}, exc_info=True)
-            return {}
+        
+        results = {}
+        if pending:
+            try:
+                # Multi-query Gemini calls; AIService applies the response schema,
+                # API timeout and rate-limit backoff. Batch prompts carry no news,
+                # technicals or user thesis.
+                items = [
+                    SignalInput(ticker, market_data, [], None, macro_context)
+                    for ticker, market_data in pending.items()
+                ]
+                analyses = self.ai_service.analyze_signals_batch(items)
+                results = {item.ticker: analysis for item, analysis in zip(items, analyses) if analysis}
+            except Exception as e:
+                logger.error(f"Batch analysis error: {str(e)[:100]}", extra={'tickers': tickers}, exc_info=True)
+        
+        # Save new and re-used analyses in a single upsert
+        now_iso = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for ticker, analysis in {**results, **unchanged}.items():
+            row = self._build_ticker_insight(ticker, analysis, batch_data[ticker], macro_context, now_iso)
+            if row:
+                rows.append(row)
+        saved_rows = self._save_ticker_insights(rows)
+        
+        saved_count = 0
+        for row in saved_rows:
+            ticker = row['ticker']
+            if ticker not in results:
+                continue  # keep the price the re-used analysis was made at
+            saved_count += 1
+            self._recent_analyses.set(ticker, (
+                row['current_price'],
+                self._input_signature(batch_data[ticker], macro_context),
+                results[ticker]
+            ))
+        
+        logger.info(
+            f"Batch analysis complete: saved={saved_count}, refreshed={len(saved_rows) - saved_count}, total={len(results)}",
+            extra={'saved_count': saved_count, 'refreshed_count': len(saved_rows) - saved_count, 'total_count': len(results)}
+        )
+        return results
     
-    def _create_batch_prompt(self, batch_data: dict, macro_context=None) -> str:
-        """Create AI prompt for analyzing multiple stocks"""
-        stocks_info = []
+    def _input_signature(self, market_data: dict, macro_context=None) -> tuple:
+        """Slow-moving analysis inputs that must match exactly for a ticker to count as unchanged"""
+        return (
+            safe_float(market_data.get('pe_ratio')),
+            safe_float(market_data.get('shortPercentOfFloat')),
+            macro_context.get('market_sentiment') if macro_context else None  # VIX bucket
+        )
+    
+    def _previous_analysis(self, ticker: str, market_data: dict, macro_context=None) -> dict:
+        """
+        Return the ticker's last saved analysis if its inputs have not materially changed.
         
-        for ticker, data in batch_data.items():
-            stocks_info.append(f"""
-{ticker}:
-Price: ${data.get('price', 'N/A')}, P/E: {data.get('pe_ratio', 'N/A')}, 
-Market Cap: {data.get('market_cap', 'N/A')}, Beta: {data.get('beta', 'N/A')},
-Short %: {data.get('shortPercentOfFloat', 'N/A')}, Analyst: {data.get('recommendationKey', 'N/A')}""")
+        Args:
+            ticker: Stock symbol
+            market_data: Freshly fetched market data
+            macro_context: Pre-fetched VIX and market sentiment
         
-        vix_info = f"VIX: {macro_context.get('vix', 'N/A')}" if macro_context else ""
+        Returns:
+            Previous analysis, or None if the ticker needs a new AI call
+        """
+        previous = self._recent_analyses.get(ticker)
+        if previous is None:
+            return None
         
-        return f"""Analyze these {len(batch_data)} stocks and provide objective market scores.
-{vix_info}
-
-{''.join(stocks_info)}
-
-For EACH stock, provide:
-- score: 0-100 (objective market strength)
-- risk: Low/Medium/High/Extreme
-- summary: 1 sentence analysis
-
-Respond ONLY with valid JSON (no markdown):
-{{"TICKER": {{"score": 75, "risk": "Medium", "summary": "Brief analysis"}}, ...}}"""
-    
-    def _parse_batch_response(self, response_text: str, tickers: list) -> dict:
-        """Parse JSON response from batch AI analysis"""
-        try:
-            # Remove markdown code blocks if present
-            cleaned = re.sub(r'```json\n?|\n?```', '', response_text.strip())
-            
-            # Find JSON object
-            json_match = re.search(r'\{.*\}', cleaned, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-                return data
-            
-            logger.warning("Failed to parse JSON from batch response", extra={'tickers': tickers})
-            return {}
-            
-        except Exception as e:
-            logger.error(f"Batch response parse error: {str(e)[:100]}", extra={'tickers': tickers}, exc_info=True)
-            return {}
+        last_price, last_signature, analysis = previous
+        price = safe_float(market_data.get('price'))
+        if not price or not last_price:
+            return None
+        if abs(price - last_price) / last_price >= ANALYST_UNCHANGED_PRICE_MOVE:
+            return None
+        if self._input_signature(market_data, macro_context) != last_signature:
+            return None
+        return analysis
     
     def _calculate_risk_from_score(self, sentiment_score: int) -> str:
         """
@@ -316,64 +348,80 @@ Respond ONLY with valid JSON (no markdown):
         else:
             return "High"
     
-    def _save_ticker_insight(self, ticker: str, analysis: dict, market_data: dict, macro_context=None) -> bool:
-        """Save individual ticker analysis to database"""
+    def _build_ticker_insight(self, ticker: str, analysis: dict, market_data: dict, macro_context=None, now_iso: str = None) -> dict:
+        """
+        Build the ticker_insights row for one batch analysis.
+        
+        Args:
+            ticker: Stock symbol
+            analysis: Validated AI result from analyze_signals_batch
+            market_data: Market data used for the analysis
+            macro_context: Pre-fetched VIX and market sentiment
+            now_iso: Shared updated_at timestamp for the batch
+        
+        Returns:
+            Row dictionary, or None if the analysis is malformed
+        """
         try:
-            ai_score = int(analysis.get('score', 50))
-            ai_signal = self.get_signal_label(ai_score)
-            # Calculate risk from score for consistency (inverse relationship)
-            ai_risk = self._calculate_risk_from_score(ai_score)
-            ai_summary = analysis.get('summary', 'No analysis available')
-            
-            ticker_insight = {
-                'ticker': ticker,
-                'ai_score': ai_score,
-                'ai_signal': ai_signal,
-                'ai_risk': ai_risk,
-                'ai_summary': ai_summary,
-                'current_price': safe_float(market_data.get('price')),
-                'market_cap': market_data.get('market_cap'),
-                'pe_ratio': safe_float(market_data.get('pe_ratio')),
-                'analyst_rating': market_data.get('recommendationKey'),
-                'target_price': safe_float(market_data.get('targetMean')),
-                'short_float': safe_float(market_data.get('shortPercentOfFloat')),
-                'insider_held': safe_float(market_data.get('heldPercentInsiders')),
-                # Enhanced fundamental metrics
-                'roe': safe_float(market_data.get('returnOnEquity')),
-                'profit_margin': safe_float(market_data.get('profitMargins')),
-                'revenue_growth': safe_float(market_data.get('revenueGrowth')),
-                'earnings_growth': safe_float(market_data.get('earningsGrowth')),
-                'debt_to_equity': safe_float(market_data.get('debtToEquity')),
-                'current_ratio': safe_float(market_data.get('currentRatio')),
-                # Dividend metrics
-                'dividend_yield': safe_float(market_data.get('dividendYield')),
-                'payout_ratio': safe_float(market_data.get('payoutRatio')),
-                # 52-week range
-                'week_52_high': safe_float(market_data.get('fiftyTwoWeekHigh')),
-                'week_52_low': safe_float(market_data.get('fiftyTwoWeekLow')),
-                # Sector context
-                'sector': market_data.get('sector'),
-                'industry': market_data.get('industry'),
-                # Macro context
-                'vix': safe_float(macro_context.get('vix')) if macro_context else None,
-                'market_sentiment': macro_context.get('market_sentiment') if macro_context else None,
-                'updated_at': datetime.now(timezone.utc).isoformat()
-            }
-            
-            self.db.supabase.table('ticker_insights').upsert(
-                ticker_insight,
-                on_conflict='ticker'
-            ).execute()
-            
+            ai_score = int(analysis['sentiment_score'])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Malformed batch analysis: ticker={ticker}", extra={'ticker': ticker})
+            return None
+        
+        ai_signal = self.get_signal_label(ai_score)
+        # Calculate risk from score for consistency (inverse relationship)
+        ai_risk = self._calculate_risk_from_score(ai_score)
+        ai_summary = analysis.get('summary') or 'No analysis available'
+        
+        return {
+            'ticker': ticker,
+            'ai_score': ai_score,
+            'ai_signal': ai_signal,
+            'ai_risk': ai_risk,
+            'ai_summary': ai_summary,
+            **market_insight_columns(market_data, macro_context),
+            'updated_at': now_iso or datetime.now(timezone.utc).isoformat()
+        }
+    
+    def _save_ticker_insights(self, rows: list) -> list:
+        """
+        Upsert a batch of ticker_insights rows in one request.
+        
+        If the batch upsert fails, rows are retried one at a time so a single
+        bad row doesn't drop the whole batch and the offender gets logged.
+        
+        Args:
+            rows: Rows built by _build_ticker_insight
+        
+        Returns:
+            Rows that were saved
+        """
+        if not rows:
+            return []
+        
+        try:
+            self.db.supabase.table('ticker_insights').upsert(rows, on_conflict='ticker').execute()
+            saved_rows = rows
+        except Exception as e:
+            tickers = [row['ticker'] for row in rows]
+            logger.warning(
+                f"Batch upsert failed, retrying per row: tickers={tickers}, error={str(e)[:100]}",
+                extra={'tickers': tickers}
+            )
+            saved_rows = []
+            for row in rows:
+                try:
+                    self.db.supabase.table('ticker_insights').upsert(row, on_conflict='ticker').execute()
+                    saved_rows.append(row)
+                except Exception:
+                    logger.error(f"Failed to save ticker insight: ticker={row['ticker']}", extra={'ticker': row['ticker']}, exc_info=True)
+        
+        for row in saved_rows:
             logger.debug(
-                f"Saved ticker insight: ticker={ticker}, score={ai_score}, signal={ai_signal}, risk={ai_risk}",
-                extra={'ticker': ticker, 'ai_score': ai_score, 'ai_signal': ai_signal, 'ai_risk': ai_risk}
+                f"Saved ticker insight: ticker={row['ticker']}, score={row['ai_score']}, signal={row['ai_signal']}, risk={row['ai_risk']}",
+                extra={'ticker': row['ticker'], 'ai_score': row['ai_score'], 'ai_signal': row['ai_signal'], 'ai_risk': row['ai_risk']}
             )
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to save ticker insight: ticker={ticker}", extra={'ticker': ticker}, exc_info=True)
-            return False
+        return saved_rows
     
     def analyze_ticker(self, ticker: str, macro_context=None) -> bool:
         """
@@ -396,60 +444,36 @@ Respond ONLY with valid JSON (no markdown):
                 else:
                     logger.debug(f"Analyzing ticker: {ticker}")
                 
-                # 1. Fetch market data
-                market_data = self.data_engine.get_price_context(ticker)
+                # 1. Fetch market data, technicals and news concurrently
+                price_future = _FETCH_EXECUTOR.submit(self.data_engine.get_price_context, ticker)
+                technicals_future = _FETCH_EXECUTOR.submit(self.data_engine.get_technical_analysis, ticker)
+                news_future = _FETCH_EXECUTOR.submit(self.data_engine.get_latest_news, ticker)
+                
+                market_data = price_future.result()
                 
                 if not market_data:
                     logger.warning(f"No market data available: ticker={ticker}", extra={'ticker': ticker})
                     return False
                 
-                # 2. Fetch technicals and news
-                technicals = self.data_engine.get_technical_analysis(ticker)
-                news = self.data_engine.get_latest_news(ticker)
+                # 2. Collect technicals and news
+                technicals = technicals_future.result()
+                news = compact_news(news_future.result())
                 
                 # Check if AI service is available
                 if not self.ai_available or not self.ai_service:
                     logger.warning(f"AI service not available. Skipping analysis for {ticker}")
                     return False
                 
-                # 3. Run AI Analysis with retry handling
+                # 3. Run AI Analysis (AIService handles rate-limit retries and returns None on failure)
                 # CRITICAL: Pass user_post_text=None for objective market analysis
-                try:
-                    insight = self.ai_service.analyze_signal(
-                        ticker=ticker,
-                        market_data=market_data,
-                        news=news,
-                        technicals=technicals,
-                        macro_context=macro_context,
-                        user_post_text=None  # No user bias - pure market analysis
-                    )
-                except Exception as ai_error:
-                    error_msg = str(ai_error)
-                    
-                    # Check if it's a rate limit error (429)
-                    if '429' in error_msg or 'quota' in error_msg.lower():
-                        # Extract retry delay from error message if available
-                        retry_match = re.search(r'retry in (\d+\.?\d*)', error_msg.lower())
-                        if retry_match:
-                            retry_delay = float(retry_match.group(1))
-                        else:
-                            # Use exponential backoff
-                            retry_delay = base_delay * (2 ** attempt)
-                        
-                        if attempt < max_retries - 1:
-                            logger.warning(f"Rate limit hit, waiting {retry_delay:.1f}s: ticker={ticker}", extra={
-                                'ticker': ticker, 'retry_delay': retry_delay, 'attempt': attempt
-                            })
-                            time.sleep(retry_delay)
-                            continue
-                        else:
-                            logger.error(f"Rate limit exceeded after {max_retries} attempts: ticker={ticker}", extra={
-                                'ticker': ticker, 'max_retries': max_retries
-                            })
-                            return False
-                    else:
-                        # Non-rate-limit error
-                        raise ai_error
+                insight = self.ai_service.analyze_signal(
+                    ticker=ticker,
+                    market_data=market_data,
+                    news=news,
+                    technicals=technicals,
+                    macro_context=macro_context,
+                    user_post_text=None  # No user bias - pure market analysis
+                )
                 
                 if not insight:
                     logger.error(f"AI analysis failed: ticker={ticker}", extra={'ticker': ticker})
@@ -468,33 +492,7 @@ Respond ONLY with valid JSON (no markdown):
                     'ai_signal': ai_signal,
                     'ai_risk': ai_risk,
                     'ai_summary': ai_summary,
-                    'current_price': safe_float(market_data.get('price')),
-                    'market_cap': market_data.get('market_cap'),
-                    'pe_ratio': safe_float(market_data.get('pe_ratio')),
-                    # God Mode institutional data
-                    'analyst_rating': market_data.get('recommendationKey'),
-                    'target_price': safe_float(market_data.get('targetMean')),
-                    'short_float': safe_float(market_data.get('shortPercentOfFloat')),
-                    'insider_held': safe_float(market_data.get('heldPercentInsiders')),
-                    # Enhanced fundamental metrics
-                    'roe': safe_float(market_data.get('returnOnEquity')),
-                    'profit_margin': safe_float(market_data.get('profitMargins')),
-                    'revenue_growth': safe_float(market_data.get('revenueGrowth')),
-                    'earnings_growth': safe_float(market_data.get('earningsGrowth')),
-                    'debt_to_equity': safe_float(market_data.get('debtToEquity')),
-                    'current_ratio': safe_float(market_data.get('currentRatio')),
-                    # Dividend metrics
-                    'dividend_yield': safe_float(market_data.get('dividendYield')),
-                    'payout_ratio': safe_float(market_data.get('payoutRatio')),
-                    # 52-week range
-                    'week_52_high': safe_float(market_data.get('fiftyTwoWeekHigh')),
-                    'week_52_low': safe_float(market_data.get('fiftyTwoWeekLow')),
-                    # Sector context
-                    'sector': market_data.get('sector'),
-                    'industry': market_data.get('industry'),
-                    # Macro context
-                    'vix': safe_float(macro_context.get('vix')) if macro_context else None,
-                    'market_sentiment': macro_context.get('market_sentiment') if macro_context else None,
+                    **market_insight_columns(market_data, macro_context),
                     'updated_at': datetime.now(timezone.utc).isoformat()
                 }
                 
@@ -524,10 +522,47 @@ Respond ONLY with valid JSON (no markdown):
         
         return False
     
+    async def _analyze_batches_async(self, batches: list, macro_context=None) -> list:
+        """
+        Analyze batches concurrently without exceeding the Gemini request rate.
+        
+        Up to ANALYST_MAX_CONCURRENT_BATCHES batches are in flight at once. Each
+        fetches its market data first, then waits for its slot so AI requests
+        start at least 60 / ANALYST_BATCH_RPM seconds apart.
+        
+        Args:
+            batches: List of ticker lists
+            macro_context: Pre-fetched VIX and market sentiment
+        
+        Returns:
+            analyze_batch results, aligned with batches
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(ANALYST_MAX_CONCURRENT_BATCHES)
+        interval = 60.0 / ANALYST_BATCH_RPM
+        next_slot = loop.time()
+        
+        async def run(batch_num: int, batch: list) -> dict:
+            nonlocal next_slot
+            async with semaphore:
+                logger.debug(f"Processing batch {batch_num}/{len(batches)}: tickers={batch}")
+                batch_data = await asyncio.to_thread(self._fetch_batch_data, batch)
+                
+                # Reserve the next request slot; the loop is single-threaded, so no lock
+                now = loop.time()
+                slot = max(now, next_slot)
+                next_slot = slot + interval
+                await asyncio.sleep(slot - now)
+                
+                return await asyncio.to_thread(self.analyze_batch, batch, macro_context, batch_data)
+        
+        return await asyncio.gather(*(run(i, batch) for i, batch in enumerate(batches, 1)))
+    
     def analyze_all_tickers(self, ticker_list: list = None, description: str = "stocks", batch_size: int = 5):
         """
         Analyze tickers using batch processing.
-        Only runs during market hours. 20-second delay between batches.
+        Only runs during market hours. Batches run concurrently, with AI requests
+        rate-limited to ANALYST_BATCH_RPM.
         
         Args:
             ticker_list: List of tickers to analyze (defaults to tracked_tickers)
@@ -563,24 +598,12 @@ Respond ONLY with valid JSON (no markdown):
             )
         
         # Track statistics
-        total_analyzed = 0
         start_time = time.time()
         
-        # Process in batches
-        for i in range(0, len(ticker_list), batch_size):
-            batch = ticker_list[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(ticker_list) + batch_size - 1) // batch_size
-            
-            logger.debug(f"Processing batch {batch_num}/{total_batches}: tickers={batch}")
-            
-            # Analyze batch
-            results = self.analyze_batch(batch, macro_context)
-            total_analyzed += len(results)
-            
-            # Wait 20 seconds before next batch (except last batch)
-            if i + batch_size < len(ticker_list):
-                time.sleep(20)
+        # Process batches concurrently; Gemini requests are spaced by the RPM limit
+        batches = [ticker_list[i:i + batch_size] for i in range(0, len(ticker_list), batch_size)]
+        batch_results = asyncio.run(self._analyze_batches_async(batches, macro_context))
+        total_analyzed = sum(len(results) for results in batch_results)
         
         # Log summary
         elapsed = time.time() - start_time
@@ -598,6 +621,26 @@ Respond ONLY with valid JSON (no markdown):
             }
         )
     
+    def _next_run_time(self, now_et: datetime) -> datetime:
+        """
+        Find the next scheduled analysis time after now_et.
+        
+        Args:
+            now_et: Current time in US/Eastern
+        
+        Returns:
+            Timezone-aware datetime of the next weekday target time
+        """
+        for day_offset in range(8):
+            day = now_et.date() + timedelta(days=day_offset)
+            if day.weekday() >= 5:  # Saturday = 5, Sunday = 6
+                continue
+            for hour, minute in self.RUN_TIMES:
+                # localize() picks the right EST/EDT offset for that day
+                target = self.eastern.localize(datetime(day.year, day.month, day.day, hour, minute))
+                if target > now_et:
+                    return target
+    
     def run_continuous(self):
         """
         Run the analyst in continuous mode.
@@ -615,80 +658,27 @@ Respond ONLY with valid JSON (no markdown):
             }
         )
         
-        # Target times (Eastern Time)
-        target_times = [(10, 0), (12, 0), (14, 30)]  # (hour, minute)
-        last_run_date = None
-        
         try:
             while True:
+                # Sleep straight through to the next scheduled run
                 now_et = datetime.now(self.eastern)
-                current_date = now_et.date()
-                
-                # Check if market is open
-                if not self.is_market_open():
-                    # Calculate time until next market open
-                    next_open = now_et.replace(hour=9, minute=30, second=0, microsecond=0)
-                    if now_et.hour >= 16 or now_et.weekday() >= 5:
-                        # Market closed for the day or weekend
-                        if now_et.weekday() >= 5:  # Weekend
-                            days_to_monday = (7 - now_et.weekday()) % 7
-                            if days_to_monday == 0:
-                                days_to_monday = 1
-                            next_open = next_open + timedelta(days=days_to_monday)
-                        else:
-                            next_open = next_open + timedelta(days=1)
-                    
-                    logger.info(f"Market closed, next run scheduled: {next_open.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-                    sleep_seconds = (next_open - now_et).total_seconds()
-                    time.sleep(max(60, sleep_seconds))  # Sleep at least 1 min
-                    last_run_date = None  # Reset for new day
-                    continue
-                
-                # Find next target time and hour
-                next_run = None
-                next_hour = None
-                for hour, minute in target_times:
-                    target = now_et.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    if target > now_et:
-                        next_run = target
-                        next_hour = hour
-                        break
+                next_run = self._next_run_time(now_et)
+                sleep_seconds = (next_run - now_et).total_seconds()
+                logger.info(f"Next run scheduled: {next_run.strftime('%Y-%m-%d %H:%M:%S %Z')} (in {sleep_seconds/60:.1f} minutes)")
+                time.sleep(max(0, sleep_seconds))
                 
-                if next_run is None:
-                    # All runs done for today, wait until next market open
-                    next_run = now_et.replace(hour=9, minute=30, second=0, microsecond=0) + timedelta(days=1)
-                    next_hour = None
-                
-                # Check if we should run now (within 5 minutes of target time)
-                time_diff = (now_et - next_run).total_seconds()
-                if abs(time_diff) < 300 and last_run_date != current_date:  # Within 5 minutes and haven't run today
-                    logger.info(f"Scheduled run time reached: {now_et.strftime('%H:%M:%S %Z')}")
-                    
-                    # 10 AM: Refresh ticker list and analyze all
-                    if next_hour == 10:
-                        logger.info("Morning analysis: refreshing ticker list and analyzing all stocks")
-                        self.refresh_ticker_list()
-                        self.analyze_all_tickers(self.tracked_tickers, "user-interest stocks", batch_size=5)
-                    # 12 PM and 2:30 PM: Analyze current list
-                    else:
-                        logger.info(f"Analysis run: {now_et.strftime('%I:%M %p')} - User-Interest Stocks")
-                        self.analyze_all_tickers(self.tracked_tickers, "user-interest stocks", batch_size=5)
-                    
-                    last_run_date = current_date
-                    
-                    # Wait until next target time
-                    for hour, minute in target_times:
-                        target = now_et.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        if target > now_et:
-                            next_run = target
-                            break
-                    else:
-                        next_run = now_et.replace(hour=9, minute=30, second=0, microsecond=0) + timedelta(days=1)
+                now_et = datetime.now(self.eastern)
+                logger.info(f"Scheduled run time reached: {now_et.strftime('%H:%M:%S %Z')}")
                 
-                # Sleep until next run
-                sleep_seconds = max(60, (next_run - datetime.now(self.eastern)).total_seconds())
-                logger.debug(f"Next run scheduled: {next_run.strftime('%Y-%m-%d %H:%M:%S %Z')} (in {sleep_seconds/60:.1f} minutes)")
-                time.sleep(min(sleep_seconds, 300))  # Check every 5 minutes max
+                # 10 AM: Refresh ticker list and analyze all
+                if next_run.hour == 10:
+                    logger.info("Morning analysis: refreshing ticker list and analyzing all stocks")
+                    self.refresh_ticker_list()
+                    self.analyze_all_tickers(self.tracked_tickers, "user-interest stocks", batch_size=5)
+                # 12 PM and 2:30 PM: Analyze current list
+                else:
+                    logger.info(f"Analysis run: {now_et.strftime('%I:%M %p')} - User-Interest Stocks")
+                    self.analyze_all_tickers(self.tracked_tickers, "user-interest stocks", batch_size=5)
         
         except KeyboardInterrupt:
             logger.info("Global Analyst stopped by user")
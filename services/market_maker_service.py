@@ -150,11 +150,13 @@ class MarketMakerService:
                 )
                 
                 chunk_success = 0
+                # All rows from one download share its timestamp
+                updated_at = datetime.now(timezone.utc).isoformat()
                 
                 if len(chunk_tickers) == 1:
                     ticker = chunk_tickers[0]
                     if not df.empty and 'Close' in df.columns:
-                        self._process_single_ticker(ticker, df, stock_data_list)
+                        self._process_single_ticker(ticker, df, stock_data_list, updated_at)
                         chunk_success += 1
                 else:
                     for ticker in chunk_tickers:
@@ -163,7 +165,7 @@ class MarketMakerService:
                                 continue
                             
                             ticker_df = df[ticker]
-                            self._process_single_ticker(ticker, ticker_df, stock_data_list)
+                            self._process_single_ticker(ticker, ticker_df, stock_data_list, updated_at)
                             chunk_success += 1
                         except Exception as e:
                             logger.warning(f"{ticker} error: {e}")
@@ -180,7 +182,7 @@ class MarketMakerService:
         
         return stock_data_list
 
-    def _process_single_ticker(self, ticker: str, ticker_df: pd.DataFrame, stock_data_list: list):
+    def _process_single_ticker(self, ticker: str, ticker_df: pd.DataFrame, stock_data_list: list, updated_at: str = None):
         """Process a single ticker's DataFrame and append to stock_data_list."""
         try:
             if ticker_df.empty or 'Close' not in ticker_df.columns:
@@ -207,7 +209,7 @@ class MarketMakerService:
                 'symbol': ticker,
                 'price': round(float(current_price), 2),
                 'change_percent': round(float(change_percent), 2),
-                'updated_at': datetime.now(timezone.utc).isoformat()
+                'updated_at': updated_at or datetime.now(timezone.utc).isoformat()
             })
             
         except Exception as e:
@@ -1,6 +1,7 @@
 """Market data service for fetching stock information from multiple sources."""
 import logging
 import time
+import threading
 import redis
 import json
 import os
@@ -14,7 +15,17 @@ import pandas as pd
 import re
 from GoogleNews import GoogleNews
 
+from core.config import (
+    CACHE_TTL_FUNDAMENTALS,
+    CACHE_TTL_MACRO,
+    CACHE_TTL_PRICE_CONTEXT,
+    FUNDAMENTALS_CACHE_SIZE,
+    MARKET_DATA_MAX_WORKERS,
+    PRICE_CONTEXT_CACHE_SIZE,
+)
 from core.market_schema import MarketDataSchema
+from core.url_utils import clean_url
+from services.cache import TTLCache
 
 # Suppress yfinance TzCache warnings - harmless cache folder warning
 import warnings
@@ -31,6 +42,14 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# yf.download collects results in module-global state (yfinance.shared._DFS),
+# so concurrent downloads can mix up each other's frames; run them one at a time
+_DOWNLOAD_LOCK = threading.Lock()
+
+# Present in every complete .info payload (stocks, ETFs, indices); throttled
+# calls return an empty or stub dict without them
+_CORE_FUNDAMENTAL_KEYS = ('quoteType', 'fiftyTwoWeekHigh')
+
 
 class MarketDataService:
     """Handles fetching and processing market data from various sources."""
@@ -40,6 +59,13 @@ class MarketDataService:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
+        # One keep-alive session for StockTwits / news-link requests, sized for the fetch pool
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=MARKET_DATA_MAX_WORKERS)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Initialize Redis with graceful degradation
         try:
             from core.redis_utils import get_redis_url
@@ -56,6 +82,12 @@ class MarketDataService:
             self.redis = None
             self.redis_available = False
         
+        self._fundamentals_cache = TTLCache(FUNDAMENTALS_CACHE_SIZE, CACHE_TTL_FUNDAMENTALS)
+        
+        # Process-local tier in front of Redis: memory -> Redis -> yfinance
+        self._price_cache = TTLCache(PRICE_CONTEXT_CACHE_SIZE, CACHE_TTL_PRICE_CONTEXT)
+        self._macro_cache = TTLCache(1, CACHE_TTL_MACRO)
+        
         logger.info("Market data service initialized")
 
     def get_macro_context(self) -> Optional[Dict[str, Any]]:
@@ -65,6 +97,22 @@ class MarketDataService:
         Returns:
             Dictionary with VIX value and market sentiment
         """
+        cache_key = "market:macro:vix"
+        
+        cached = self._macro_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if self.redis_available:
+            try:
+                cached_data = self.redis.get(cache_key)
+                if cached_data:
+                    cached = json.loads(cached_data)
+                    self._macro_cache.set(cache_key, cached)
+                    return cached
+            except Exception as e:
+                logger.warning(f"Redis cache read error: {e}")
+        
         try:
             vix = yf.Ticker("^VIX")
             vix_price = vix.fast_info.last_price
@@ -81,33 +129,121 @@ class MarketDataService:
             else:
                 sentiment = "Extreme Fear"
             
-            return {
+            data = {
                 "vix": round(vix_price, 2),
                 "market_sentiment": sentiment
             }
         except Exception as e:
             logger.error(f"Failed to fetch VIX data: {str(e)}")
             return {"vix": "N/A", "market_sentiment": "Unknown"}
+        
+        self._macro_cache.set(cache_key, data)
+        if self.redis_available:
+            try:
+                self.redis.setex(cache_key, CACHE_TTL_MACRO, json.dumps(data))
+            except Exception as e:
+                logger.warning(f"Redis cache write error: {e}")
+        
+        return data
+
+    def _get_fundamentals(self, stock: yf.Ticker) -> Dict[str, Any]:
+        """
+        Return the ticker's .info payload, fetched at most once per ticker per day.
+        
+        Fundamentals (P/E, ownership, short interest, analyst targets) change daily
+        at most, so the intraday runs reuse the first fetch and only refresh prices.
+        
+        Args:
+            stock: yfinance Ticker object
+            
+        Returns:
+            The .info dictionary
+        """
+        cache_key = f"{stock.ticker.upper()}:{datetime.now().date().isoformat()}"
+        info = self._fundamentals_cache.get(cache_key)
+        if info is None:
+            info = stock.info
+            # Don't let one rate-limited call serve blank fundamentals all day
+            if info and all(info.get(key) is not None for key in _CORE_FUNDAMENTAL_KEYS):
+                self._fundamentals_cache.set(cache_key, info)
+            else:
+                logger.debug(f"Not caching incomplete fundamentals: ticker={stock.ticker}")
+        return info
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch last price, previous close and volume for many tickers in one request.
+        
+        Args:
+            tickers: Stock ticker symbols
+            
+        Returns:
+            Dictionary of {ticker: {price, previous_close, volume}}; tickers
+            without data are omitted
+        """
+        if not tickers:
+            return {}
+        
+        try:
+            with _DOWNLOAD_LOCK:
+                df = yf.download(
+                    tickers,
+                    period="5d",
+                    interval="1d",
+                    group_by='ticker',
+                    progress=False,
+                    threads=True,
+                    auto_adjust=False
+                )
+        except Exception as e:
+            logger.warning(f"Bulk quote download failed: {str(e)}")
+            return {}
+        
+        quotes = {}
+        for ticker in tickers:
+            try:
+                ticker_df = df[ticker] if isinstance(df.columns, pd.MultiIndex) else df
+                closes = ticker_df['Close'].dropna()
+                volumes = ticker_df['Volume'].dropna()
+            except KeyError:
+                continue
+            if closes.empty:
+                continue
+            
+            quotes[ticker] = {
+                "price": float(closes.iloc[-1]),
+                "previous_close": float(closes.iloc[-2]) if len(closes) > 1 else None,
+                "volume": float(volumes.iloc[-1]) if not volumes.empty else None
+            }
+        
+        return quotes
 
-    def get_price_context(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def get_price_context(self, ticker: str, quote: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Fetch current price and fundamental data.
         
         Args:
             ticker: Stock ticker symbol
+            quote: Optional entry from get_quotes(); skips the per-ticker price lookups
             
         Returns:
             Dictionary with price, volume, and fundamental metrics
         """
         cache_key = f"stock:price:{ticker.upper()}"
         
-        # Step A: Read Cache
+        # Step A: Read Cache (process memory, then Redis)
+        cached = self._price_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         if self.redis_available:
             try:
                 cached_data = self.redis.get(cache_key)
                 if cached_data:
                     logger.debug(f"Cache hit: ticker={ticker}, type=price_data")
-                    return json.loads(cached_data)
+                    cached = json.loads(cached_data)
+                    self._price_cache.set(cache_key, cached)
+                    return cached
             except Exception as e:
                 logger.warning(f"Redis cache read error: {e}")
         
@@ -115,17 +251,29 @@ class MarketDataService:
         try:
             stock = yf.Ticker(ticker)
             
-            price = stock.fast_info.last_price
-            prev_close = stock.fast_info.previous_close
-            volume = stock.fast_info.last_volume
+            if quote:
+                price = quote['price']
+                prev_close = quote['previous_close']
+                volume = quote['volume']
+            else:
+                price = stock.fast_info.last_price
+                prev_close = stock.fast_info.previous_close
+                volume = stock.fast_info.last_volume
             
-            info = stock.info
+            info = self._get_fundamentals(stock)
             
             change_percent = 0.0
             if prev_close:
                 change_percent = ((price - prev_close) / prev_close) * 100
 
-            mcap = info.get('marketCap', 0)
+            # .info is already loaded for the fundamentals below, so read marketCap from it;
+            # fast_info (shares x last price) is only consulted when Yahoo omits the field
+            mcap = info.get('marketCap')
+            if not mcap:
+                try:
+                    mcap = stock.fast_info.market_cap or 0
+                except (KeyError, TypeError, ValueError, OSError):
+                    mcap = 0
             if mcap > 1_000_000_000_000:
                 mcap_str = f"${round(mcap/1_000_000_000_000, 2)}T"
             elif mcap > 1_000_000_000:
@@ -211,9 +359,10 @@ class MarketDataService:
                         return None
             
             # Step C: Write Cache
+            self._price_cache.set(cache_key, data)
             if self.redis_available:
                 try:
-                    self.redis.setex(cache_key, 60, json.dumps(data))  # 60 second TTL
+                    self.redis.setex(cache_key, CACHE_TTL_PRICE_CONTEXT, json.dumps(data))
                     logger.debug(f"Cached price data: ticker={ticker}")
                 except Exception as e:
                     logger.warning(f"Redis cache write error: {e}")
@@ -237,7 +386,7 @@ class MarketDataService:
         """
         url = f"https://api.stocktwits.com/api/2/streams/symbol/{ticker}.json"
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -403,65 +552,6 @@ class MarketDataService:
             logger.error(f"Failed to fetch technical analysis for {ticker}: {str(e)}")
             return None
         
-    def _clean_url(self, url: str) -> str:
-        """
-        Clean URL by removing Google tracking parameters and fixing malformed URLs.
-        
-        Args:
-            url: URL that may contain tracking parameters
-            
-        Returns:
-            Cleaned URL without tracking parameters
-        """
-        if not url or not isinstance(url, str):
-            return url or ''
-        
-        try:
-            from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-            
-            # Fix URLs that have & instead of ? for query params (malformed)
-            if '&ved=' in url and '?' not in url.split('://')[1].split('/')[0]:
-                # Find where query params start (first & after domain)
-                parts = url.split('://', 1)
-                if len(parts) == 2:
-                    scheme = parts[0]
-                    rest = parts[1]
-                    # Find first & that's likely a query param
-                    if '&' in rest:
-                        path_part, query_part = rest.split('&', 1)
-                        url = f"{scheme}://{path_part}?{query_part}"
-            
-            parsed = urlparse(url)
-            
-            # Remove Google tracking parameters
-            query_params = parse_qs(parsed.query, keep_blank_values=True)
-            params_to_remove = ['ved', 'usg', 'utm_source', 'utm_medium', 'utm_campaign', 
-                               'utm_term', 'utm_content', 'gclid', 'fbclid', '_ga']
-            
-            cleaned_params = {k: v for k, v in query_params.items() 
-                            if k.lower() not in params_to_remove}
-            
-            # Reconstruct URL without tracking parameters
-            if cleaned_params:
-                new_query = urlencode(cleaned_params, doseq=True)
-            else:
-                new_query = ''
-            
-            cleaned_url = urlunparse((
-                parsed.scheme,
-                parsed.netloc,
-                parsed.path,
-                parsed.params,
-                new_query,
-                ''  # Remove fragment
-            ))
-            
-            return cleaned_url
-            
-        except Exception as e:
-            logger.debug(f"Failed to clean URL {url[:50]}...: {str(e)}")
-            return url
-    
     def _resolve_google_news_link(self, url: str) -> str:
         """
         Resolve Google News redirect links to actual article URLs.
@@ -476,18 +566,18 @@ class MarketDataService:
             return url or ''
         
         # First clean the URL to remove tracking parameters
-        url = self._clean_url(url)
+        url = clean_url(url)
         
         # Check if it's a Google News redirect
         if 'news.google.com' in url or 'google.com/url' in url:
             try:
                 from urllib.parse import urlparse, parse_qs
                 
-                response = requests.head(url, allow_redirects=True, timeout=5, headers=self.headers)
+                response = self.session.head(url, allow_redirects=True, timeout=5)
                 resolved_url = response.url
                 
                 # Clean the resolved URL
-                resolved_url = self._clean_url(resolved_url)
+                resolved_url = clean_url(resolved_url)
                 
                 # If still a Google redirect, try to extract from query params
                 if 'google.com' in resolved_url and 'url=' in resolved_url:
@@ -495,7 +585,7 @@ class MarketDataService:
                     query_params = parse_qs(parsed.query)
                     if 'url' in query_params:
                         resolved_url = query_params['url'][0]
-                        resolved_url = self._clean_url(resolved_url)
+                        resolved_url = clean_url(resolved_url)
                 
                 # Validate the resolved URL
                 if resolved_url and resolved_url != url and 'http' in resolved_url:
@@ -540,7 +630,7 @@ class MarketDataService:
                             link = f"https://finance.yahoo.com/news/{article.get('uuid', '')}"
                     
                     # Clean URL to remove any tracking parameters
-                    link = self._clean_url(link or '')
+                    link = clean_url(link or '')
                     
                     # Parse date
                     pub_date = article.get('providerPublishTime', 0)
@@ -581,7 +671,7 @@ class MarketDataService:
                     
                     # Resolve Google News redirect links and clean tracking parameters
                     resolved_link = self._resolve_google_news_link(item.get('link', ''))
-                    cleaned_link = self._clean_url(resolved_link)
+                    cleaned_link = clean_url(resolved_link)
                     
                     news_items.append({
                         "source": item.get('media', 'Unknown'),
@@ -600,6 +690,28 @@ class MarketDataService:
         return news_items[:limit]
 
 
+_service_singleton: Optional[MarketDataService] = None
+_service_lock = threading.Lock()
+
+
+def get_market_service() -> MarketDataService:
+    """
+    Return the process-wide MarketDataService, creating it on first use.
+    
+    Sharing one instance lets its in-process price/macro caches and HTTP
+    session persist across API requests.
+    
+    Returns:
+        Shared MarketDataService instance
+    """
+    global _service_singleton
+    if _service_singleton is None:
+        with _service_lock:
+            if _service_singleton is None:
+                _service_singleton = MarketDataService()
+    return _service_singleton
+
+
 def main():
     """Test the market data service."""
     logging.basicConfig(
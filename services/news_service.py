@@ -6,11 +6,16 @@ import logging
 import warnings
 import yfinance as yf
 import requests
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import threading
 import time
 import re
 
+from core.config import NEWS_FETCH_RATE, NEWS_FETCH_WORKERS
+from core.url_utils import clean_url
+
 logger = logging.getLogger(__name__)
 
 # Suppress yfinance TzCache warnings
@@ -19,6 +24,24 @@ yfinance_logger.setLevel(logging.WARNING)
 warnings.filterwarnings('ignore', message='.*TzCache.*')
 
 
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads."""
+    
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self) -> None:
+        """Block until the caller's reserved slot arrives."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 class NewsService:
     """Service for fetching and updating market news."""
     
@@ -28,65 +51,9 @@ class NewsService:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        self._yahoo_limiter = _RateLimiter(NEWS_FETCH_RATE)
         logger.info("News Service initialized")
     
-    def _clean_url(self, url: str) -> str:
-        """
-        Clean URL by removing Google tracking parameters and fixing malformed URLs.
-        
-        Args:
-            url: URL that may contain tracking parameters
-            
-        Returns:
-            Cleaned URL without tracking parameters
-        """
-        if not url or not isinstance(url, str):
-            return url or ''
-        
-        try:
-            # Fix URLs that have & instead of ? for query params (malformed)
-            if '&ved=' in url and '?' not in url.split('://')[1].split('/')[0]:
-                # Find where query params start (first & after domain)
-                parts = url.split('://', 1)
-                if len(parts) == 2:
-                    scheme = parts[0]
-                    rest = parts[1]
-                    # Find first & that's likely a query param
-                    if '&' in rest:
-                        path_part, query_part = rest.split('&', 1)
-                        url = f"{scheme}://{path_part}?{query_part}"
-            
-            parsed = urlparse(url)
-            
-            # Remove Google tracking parameters
-            query_params = parse_qs(parsed.query, keep_blank_values=True)
-            params_to_remove = ['ved', 'usg', 'utm_source', 'utm_medium', 'utm_campaign', 
-                               'utm_term', 'utm_content', 'gclid', 'fbclid', '_ga']
-            
-            cleaned_params = {k: v for k, v in query_params.items() 
-                                if k.lower() not in params_to_remove}
-            
-            # Reconstruct URL without tracking parameters
-            if cleaned_params:
-                new_query = urlencode(cleaned_params, doseq=True)
-            else:
-                new_query = ''
-            
-            cleaned_url = urlunparse((
-                parsed.scheme,
-                parsed.netloc,
-                parsed.path,
-                parsed.params,
-                new_query,
-                ''  # Remove fragment
-            ))
-            
-            return cleaned_url
-            
-        except Exception as e:
-            logger.warning(f"Failed to clean URL {url[:50]}...: {str(e)}")
-            return url
-    
     def _is_valid_news_item(self, title: str, source: str, link: str) -> bool:
         """
         Validate news item to filter out spam and low-quality content.
@@ -187,7 +154,7 @@ class NewsService:
             return url or ''
         
         # First clean the URL to remove tracking parameters
-        url = self._clean_url(url)
+        url = clean_url(url)
         
         # Check if it's a Google News redirect
         if 'news.google.com' in url or 'google.com/url' in url:
@@ -197,7 +164,7 @@ class NewsService:
                 resolved_url = response.url
                 
                 # Clean the resolved URL
-                resolved_url = self._clean_url(resolved_url)
+                resolved_url = clean_url(resolved_url)
                 
                 # If still a Google redirect, try to extract from query params
                 if 'google.com' in resolved_url and 'url=' in resolved_url:
@@ -205,7 +172,7 @@ class NewsService:
                     query_params = parse_qs(parsed.query)
                     if 'url' in query_params:
                         resolved_url = query_params['url'][0]
-                        resolved_url = self._clean_url(resolved_url)
+                        resolved_url = clean_url(resolved_url)
                 
                 # Validate the resolved URL
                 if resolved_url and resolved_url != url and 'http' in resolved_url:
@@ -216,6 +183,24 @@ class NewsService:
         
         return url
     
+    def _fetch_ticker_news(self, ticker: str) -> list:
+        """
+        Fetch raw Yahoo Finance articles for a single ticker.
+        
+        Args:
+            ticker: Symbol to fetch news for
+            
+        Returns:
+            List of article dicts (empty if the request fails)
+        """
+        self._yahoo_limiter.wait()
+        try:
+            return yf.Ticker(ticker).news or []
+        except Exception as e:
+            # One bad ticker (rate limit, malformed payload) must not abort the refresh
+            logger.warning(f"Failed to fetch Yahoo Finance news for {ticker}: {str(e)}")
+            return []
+    
     def _fetch_yahoo_news(self, topics: list, limit_per_topic: int = 10) -> list:
         """
         Fetch news from Yahoo Finance using major market tickers.
@@ -235,62 +220,60 @@ class NewsService:
             "Crypto": ["BTC-USD", "ETH-USD"],
             "Federal Reserve": ["^TNX", "^FVX", "DXY"]
         }
+        tickers = list(dict.fromkeys(
+            ticker for topic in topics for ticker in topic_tickers.get(topic, ["SPY"])  # Default to SPY
+        ))
+        
+        # Fetch concurrently; map() keeps ticker order so deduplication stays deterministic
+        with ThreadPoolExecutor(max_workers=min(NEWS_FETCH_WORKERS, len(tickers)) or 1) as executor:
+            ticker_news = list(executor.map(self._fetch_ticker_news, tickers))
         
         seen_titles = set()  # Deduplicate by title
         
-        for topic in topics:
-            tickers = topic_tickers.get(topic, ["SPY"])  # Default to SPY
-            
-            for ticker in tickers:
+        for news in ticker_news:
+            for article in news[:limit_per_topic]:
                 try:
-                    stock = yf.Ticker(ticker)
-                    news = stock.news
+                    title = (article.get('title') or '').strip()
+                    if not title or title in seen_titles:
+                        continue
                     
-                    if news:
-                        for article in news[:limit_per_topic]:
-                            title = article.get('title', '').strip()
-                            if not title or title in seen_titles:
-                                continue
-                            
-                            seen_titles.add(title)
-                            
-                            # Yahoo Finance news has direct links
-                            link = article.get('link', '')
-                            if not link or 'yahoo.com' not in link:
-                                # Sometimes link is in uuid format, construct proper URL
-                                if 'uuid' in article:
-                                    link = f"https://finance.yahoo.com/news/{article.get('uuid', '')}"
-                            
-                            # Clean URL to remove any tracking parameters
-                            cleaned_link = self._clean_url(link or '')
-                            source = article.get('publisher', 'Yahoo Finance')
-                            
-                            # Validate news item before adding
-                            if not self._is_valid_news_item(title, source, cleaned_link):
-                                logger.debug(f"Filtered out invalid news item: {title[:50]}...")
-                                continue
-                            
-                            # Parse date
-                            pub_date = article.get('providerPublishTime', 0)
-                            if pub_date:
-                                try:
-                                    date_str = datetime.fromtimestamp(pub_date).strftime('%Y-%m-%d %H:%M:%S')
-                                except:
-                                    date_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            else:
-                                date_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            
-                            news_items.append({
-                                'title': title,
-                                'source': source,
-                                'link': cleaned_link,
-                                'date': date_str
-                            })
+                    seen_titles.add(title)
                     
-                    time.sleep(0.5)  # Rate limiting
+                    # Yahoo Finance news has direct links
+                    link = article.get('link', '')
+                    if not link or 'yahoo.com' not in link:
+                        # Sometimes link is in uuid format, construct proper URL
+                        if 'uuid' in article:
+                            link = f"https://finance.yahoo.com/news/{article.get('uuid', '')}"
+                    
+                    # Clean URL to remove any tracking parameters
+                    cleaned_link = clean_url(link or '')
+                    source = article.get('publisher', 'Yahoo Finance')
+                    
+                    # Validate news item before adding
+                    if not self._is_valid_news_item(title, source, cleaned_link):
+                        logger.debug(f"Filtered out invalid news item: {title[:50]}...")
+                        continue
+                    
+                    # Parse date
+                    pub_date = article.get('providerPublishTime', 0)
+                    if pub_date:
+                        try:
+                            date_str = datetime.fromtimestamp(pub_date).strftime('%Y-%m-%d %H:%M:%S')
+                        except:
+                            date_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    else:
+                        date_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    
+                    news_items.append({
+                        'title': title,
+                        'source': source,
+                        'link': cleaned_link,
+                        'date': date_str
+                    })
                 except Exception as e:
-                    logger.warning(f"Failed to fetch Yahoo Finance news for {ticker}: {str(e)}")
-                    continue
+                    # Skip malformed articles instead of dropping the rest of the feed
+                    logger.debug(f"Skipping malformed Yahoo Finance article: {str(e)}")
         
         return news_items
     
@@ -320,7 +303,7 @@ class NewsService:
                     
                     # Resolve Google News redirect links and clean tracking parameters
                     resolved_link = self._resolve_google_news_link(link)
-                    cleaned_link = self._clean_url(resolved_link)
+                    cleaned_link = clean_url(resolved_link)
                     
                     # Validate news item before adding
                     if not self._is_valid_news_item(title, source, cleaned_link):
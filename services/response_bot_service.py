@@ -6,43 +6,19 @@ import redis
 import json
 import os
 from datetime import datetime, timezone
+from core.insight_columns import market_insight_columns, safe_float
 from services.market_service import MarketDataService
-from services.ai_service import AIService
+from services.ai_service import compact_news, get_ai_service
 from services.db_service import DatabaseService
 
 logger = logging.getLogger(__name__)
 
 
-def safe_float(value):
-    """
-    Safely convert a value to float.
-    
-    Args:
-        value: Input value to convert (string, number, or None)
-    
-    Returns:
-        float or None: Converted float value, or None if conversion fails
-    
-    Handles:
-        - None values
-        - 'N/A', '-', empty strings
-        - Invalid numeric strings
-        - Already numeric values
-    """
-    if value is None:
-        return None
-    
-    # Handle string cases
-    if isinstance(value, str):
-        value = value.strip()
-        if value in ('N/A', '-', '', 'None'):
-            return None
-    
-    # Try to convert to float
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
+# Signal label for every score 0-100 (<20 Strong Sell, <40 Sell, <60 Hold, <80 Buy)
+_SIGNAL_LABELS = tuple(
+    'Strong Buy' if s >= 80 else 'Buy' if s >= 60 else 'Hold' if s >= 40 else 'Sell' if s >= 20 else 'Strong Sell'
+    for s in range(101)
+)
 
 
 def get_signal_label(score: int) -> str:
@@ -55,16 +31,7 @@ def get_signal_label(score: int) -> str:
     Returns:
         Signal label: 'Strong Buy', 'Buy', 'Hold', 'Sell', 'Strong Sell'
     """
-    if score >= 80:
-        return 'Strong Buy'
-    elif score >= 60:
-        return 'Buy'
-    elif score >= 40:
-        return 'Hold'
-    elif score >= 20:
-        return 'Sell'
-    else:
-        return 'Strong Sell'
+    return _SIGNAL_LABELS[max(0, min(100, int(score)))]
 
 
 class ResponseBotService:
@@ -76,7 +43,7 @@ class ResponseBotService:
         
         # Initialize AI service with graceful degradation
         try:
-            self.ai_bot = AIService()
+            self.ai_bot = get_ai_service()
             self.ai_available = True
             logger.info("AI service initialized successfully")
         except Exception as e:
@@ -105,7 +72,7 @@ class ResponseBotService:
         if not self.ai_available or not self.ai_bot:
             try:
                 logger.info("Attempting to reinitialize AI service...")
-                self.ai_bot = AIService()
+                self.ai_bot = get_ai_service()
                 self.ai_available = True
                 logger.info("AI service reinitialized successfully")
                 return True
@@ -153,7 +120,7 @@ class ResponseBotService:
                 return False
 
             technicals = self.data_engine.get_technical_analysis(ticker)
-            news = self.data_engine.get_latest_news(ticker)
+            news = compact_news(self.data_engine.get_latest_news(ticker))
             
             # Recheck AI service availability before analysis
             self._ensure_ai_available()
@@ -341,15 +308,7 @@ class ResponseBotService:
                 'ai_signal': ai_signal,
                 'ai_risk': ai_risk,
                 'ai_summary': ai_summary,
-                'current_price': safe_float(market_data.get('price')),
-                'market_cap': market_data.get('market_cap'),
-                'pe_ratio': safe_float(market_data.get('pe_ratio')),
-                'analyst_rating': market_data.get('recommendationKey'),
-                'target_price': safe_float(market_data.get('targetMean')),
-                'short_float': safe_float(market_data.get('shortPercentOfFloat')),
-                'insider_held': safe_float(market_data.get('heldPercentInsiders')),
-                'vix': safe_float(macro_context.get('vix')) if macro_context else None,
-                'market_sentiment': macro_context.get('market_sentiment') if macro_context else None,
+                **market_insight_columns(market_data, macro_context),
                 'updated_at': datetime.now(timezone.utc).isoformat()
             }
             
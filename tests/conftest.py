@@ -0,0 +1,9 @@
+"""Shared pytest setup: import path and Gemini SDK configuration."""
+import os
+import sys
+
+# Modules import each other as core.* / services.* from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep AIService from loading .env credentials or configuring the Gemini SDK
+os.environ["STOCKREAD_SKIP_GENAI_INIT"] = "1"
@@ -0,0 +1,78 @@
+"""Tests for the pure helpers in services.ai_service."""
+import pytest
+
+from core.config import DEFAULT_SENTIMENT_SCORE, DEFAULT_USER_THESIS
+from services.ai_service import AIAnalysisResult, AIService, _JSONObjectScanner, _extract_json_object
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """AIService with STOCKREAD_SKIP_GENAI_INIT set and its disk cache under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    return AIService()
+
+
+NEWS = [{'title': 'Earnings beat', 'publisher': 'Reuters'}]
+TECHNICALS = {'trend': 'Uptrend', 'rsi': 55}
+
+
+@pytest.mark.parametrize('market_data, news, technicals', [
+    ({'price': 123.45}, None, None),
+    (None, NEWS, None),
+    ({}, [], TECHNICALS),
+])
+def test_insufficient_data_result_proceeds_with_any_data(service, market_data, news, technicals):
+    assert service._insufficient_data_result('NVDA', market_data, news, technicals) is None
+
+
+@pytest.mark.parametrize('market_data', [None, {}, {'price': None}, {'price': 'N/A', 'sector': 'Technology'}])
+def test_insufficient_data_result_when_everything_is_missing(service, market_data):
+    result = service._insufficient_data_result('NVDA', market_data, [], None)
+
+    assert result is not None
+    assert result['user_thesis'] == DEFAULT_USER_THESIS
+    assert result['sentiment_score'] == DEFAULT_SENTIMENT_SCORE
+    assert result['tags'] == ['NoData']
+
+
+@pytest.mark.parametrize('raw_score, expected', [
+    (72, 72),
+    (72.6, 73),
+    ('72.4', 72),
+    (150, 100),
+    (-5, 0),
+    (None, DEFAULT_SENTIMENT_SCORE),
+])
+def test_sentiment_score_is_coerced_before_bounds_check(raw_score, expected):
+    result = AIAnalysisResult(
+        user_thesis='bullish', summary='s', sentiment_score=raw_score, risk_level='low', tags='a, b'
+    )
+
+    assert result.sentiment_score == expected
+    assert result.tags == ['a', 'b']
+
+
+def test_scanner_skips_prose_fences_and_braces_in_strings():
+    text = 'Here you go:\n```json\n{"summary": "a {weird} \\"quoted\\" }", "tags": []}\n``` trailing {'
+
+    assert _extract_json_object(text) == '{"summary": "a {weird} \\"quoted\\" }", "tags": []}'
+
+
+def test_scanner_finds_nested_object():
+    assert _extract_json_object('x {"a": {"b": 1}} y') == '{"a": {"b": 1}}'
+
+
+def test_scanner_returns_none_for_incomplete_object():
+    assert _extract_json_object('{"a": {"b": 1}') is None
+    assert _extract_json_object('no json here') is None
+
+
+def test_scanner_keeps_state_across_chunks():
+    scanner = _JSONObjectScanner()
+    chunks = ['prefix {"summ', 'ary": "x}', '", "n": 1', '} suffix']
+
+    results = [scanner.feed(chunk) for chunk in chunks]
+
+    assert results[:3] == [None, None, None]
+    assert results[3] == '{"summary": "x}", "n": 1}'
+    assert scanner.scanned == sum(len(chunk) for chunk in chunks[:4])
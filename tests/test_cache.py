@@ -0,0 +1,62 @@
+"""Tests for services.cache."""
+import json
+import os
+import time
+
+from services.cache import FileCache, TTLCache
+
+
+def test_get_returns_stored_value():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set('a', {'score': 1})
+
+    assert cache.get('a') == {'score': 1}
+    assert cache.get('missing') is None
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set('a', 1, ttl=0)
+
+    assert cache.get('a') is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')  # 'b' is now least recently used
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_file_cache_sweep_removes_only_expired_entries(tmp_path):
+    cache = FileCache(str(tmp_path), default_ttl=60)
+    cache.set('fresh', 1)
+    cache.set('stale', 2)
+    cache.set('long_lived', 3, ttl=3600)
+    (tmp_path / 'orphan.tmp').write_text('{')
+    old = time.time() - 120
+    for name in ('stale.json', 'long_lived.json', 'orphan.tmp'):
+        os.utime(tmp_path / name, (old, old))
+    # Backdate the stale entry's own timestamp as well
+    entry = json.loads((tmp_path / 'stale.json').read_text())
+    entry['ts'] = old
+    (tmp_path / 'stale.json').write_text(json.dumps(entry))
+    os.utime(tmp_path / 'stale.json', (old, old))
+
+    assert cache.sweep() == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['fresh.json', 'long_lived.json']
+
+
+def test_file_cache_sweeps_every_sweep_interval_writes(tmp_path):
+    cache = FileCache(str(tmp_path), default_ttl=0, sweep_interval=3)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert len(list(tmp_path.iterdir())) == 2
+
+    cache.set('c', 3)  # third write triggers a sweep of the already-expired entries
+    assert list(tmp_path.iterdir()) == []
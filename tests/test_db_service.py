@@ -0,0 +1,57 @@
+"""Tests for services.db_service._retry_db_call."""
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from core.config import MAX_RETRIES
+from services import db_service
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(db_service.time, 'sleep', lambda _: None)
+
+
+def failing_call(errors, result='ok'):
+    """Zero-argument call that raises each error in turn, then returns result."""
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return call, calls
+
+
+def test_transient_errors_are_retried():
+    call, calls = failing_call([httpx.ConnectError('refused')] * (MAX_RETRIES - 1))
+
+    assert db_service._retry_db_call('insert', call) == 'ok'
+    assert len(calls) == MAX_RETRIES
+
+
+def test_permanent_errors_are_not_retried():
+    call, calls = failing_call([APIError({'code': '23505', 'message': 'duplicate key'})])
+
+    with pytest.raises(APIError):
+        db_service._retry_db_call('insert', call)
+    assert len(calls) == 1
+
+
+def test_read_timeouts_are_not_retried():
+    # The request may have been committed, so retrying could duplicate the row
+    call, calls = failing_call([httpx.ReadTimeout('timed out')])
+
+    with pytest.raises(httpx.ReadTimeout):
+        db_service._retry_db_call('insert', call)
+    assert len(calls) == 1
+
+
+def test_last_transient_error_is_raised():
+    call, calls = failing_call([httpx.ConnectError('refused')] * MAX_RETRIES)
+
+    with pytest.raises(httpx.ConnectError):
+        db_service._retry_db_call('insert', call)
+    assert len(calls) == MAX_RETRIES
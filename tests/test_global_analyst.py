@@ -0,0 +1,42 @@
+"""Tests for GlobalAnalyst._next_run_time."""
+from datetime import datetime
+
+import pytest
+import pytz
+
+from services.global_analyst import GlobalAnalyst
+
+EASTERN = pytz.timezone('US/Eastern')
+
+
+@pytest.fixture
+def analyst():
+    # Skip __init__, which connects to the database and market data services
+    analyst = GlobalAnalyst.__new__(GlobalAnalyst)
+    analyst.eastern = EASTERN
+    return analyst
+
+
+def et(*args):
+    return EASTERN.localize(datetime(*args))
+
+
+@pytest.mark.parametrize('now, expected', [
+    (et(2024, 3, 5, 8, 0), et(2024, 3, 5, 10, 0)),      # Tuesday before the open
+    (et(2024, 3, 5, 10, 0), et(2024, 3, 5, 12, 0)),     # exactly on a run time
+    (et(2024, 3, 5, 13, 0), et(2024, 3, 5, 14, 30)),
+    (et(2024, 3, 5, 15, 0), et(2024, 3, 6, 10, 0)),     # after the last run
+    (et(2024, 3, 8, 15, 0), et(2024, 3, 11, 10, 0)),    # Friday afternoon -> Monday
+    (et(2024, 3, 9, 12, 0), et(2024, 3, 11, 10, 0)),    # Saturday
+])
+def test_next_run_time(analyst, now, expected):
+    assert analyst._next_run_time(now) == expected
+
+
+def test_next_run_time_uses_the_target_days_utc_offset(analyst):
+    # DST starts Sunday 2024-03-10: Friday's runs are EST, Monday's are EDT
+    friday = analyst._next_run_time(et(2024, 3, 8, 13, 0))
+    monday = analyst._next_run_time(et(2024, 3, 8, 15, 0))
+
+    assert friday.utcoffset().total_seconds() == -5 * 3600
+    assert monday.utcoffset().total_seconds() == -4 * 3600